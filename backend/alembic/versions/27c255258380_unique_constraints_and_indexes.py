@@ -0,0 +1,127 @@
+"""unique constraints and indexes
+
+Adds the constraints and indexes the models declare to tables that
+predate them. apply_to_opportunity's ON CONFLICT (opportunity_id,
+student_id) needs uq_application_opportunity_student to exist. Rows that
+would violate a constraint are user data, so the migration stops and
+lists them rather than choosing which to delete.
+
+Revision ID: 27c255258380
+Revises: 77762e044479
+Create Date: 2026-10-15 08:37:54.744629
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27c255258380'
+down_revision: Union[str, Sequence[str], None] = '77762e044479'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+UNIQUE_CONSTRAINTS = (
+    (
+        "uq_application_opportunity_student",
+        "applications",
+        ("opportunity_id", "student_id"),
+    ),
+    ("uq_enrollment_student_course", "enrollments", ("student_id", "course_id")),
+)
+
+# Duplicate keys shown per table when the migration refuses to run
+MAX_REPORTED_DUPLICATES = 20
+
+# (name, table, columns, postgresql_using)
+INDEXES = (
+    ("ix_grievance_submitter_created", "grievances", ("submitter_id", "created_at"), None),
+    ("ix_grievance_status_created", "grievances", ("status", "created_at"), None),
+    ("ix_grievance_category_created", "grievances", ("category", "created_at"), None),
+    ("ix_grievance_update_grievance", "grievance_updates", ("grievance_id",), None),
+    ("ix_course_semester", "courses", ("semester",), None),
+    ("ix_course_department", "courses", ("department",), None),
+    ("ix_enrollment_course", "enrollments", ("course_id",), None),
+    ("ix_resource_course_created", "resources", ("course_id", "created_at"), None),
+    ("ix_calendar_event_course_start", "calendar_events", ("course_id", "start_date"), None),
+    ("ix_opportunity_open_created", "opportunities", ("is_open", "created_at"), None),
+    ("ix_opportunity_skills", "opportunities", ("skills",), "gin"),
+    ("ix_application_opportunity_applied", "applications", ("opportunity_id", "applied_at"), None),
+    ("ix_application_student_applied", "applications", ("student_id", "applied_at"), None),
+    ("ix_task_student_created", "tasks", ("student_id", "created_at"), None),
+)
+
+
+def has_constraint(table: str, name: str) -> bool:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND conname = :name"
+        ),
+        {"table": table, "name": name},
+    )
+    return result.scalar() is not None
+
+
+def duplicate_keys(table: str, columns: Sequence[str]) -> list:
+    key = ", ".join(columns)
+    result = op.get_bind().execute(
+        sa.text(
+            f"SELECT {key}, count(*) FROM {table} GROUP BY {key} "
+            f"HAVING count(*) > 1 ORDER BY {key}"
+        )
+    )
+    return result.all()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    missing = [
+        (name, table, columns)
+        for name, table, columns in UNIQUE_CONSTRAINTS
+        if not has_constraint(table, name)
+    ]
+
+    problems = []
+    for name, table, columns in missing:
+        duplicates = duplicate_keys(table, columns)
+        if not duplicates:
+            continue
+        problems.append(
+            f"{table}: {len(duplicates)} ({', '.join(columns)}) keys "
+            f"have more than one row, which {name} forbids:"
+        )
+        problems.extend(
+            f"  {', '.join(map(str, row[:-1]))} ({row[-1]} rows)"
+            for row in duplicates[:MAX_REPORTED_DUPLICATES]
+        )
+        if len(duplicates) > MAX_REPORTED_DUPLICATES:
+            problems.append(
+                f"  ... and {len(duplicates) - MAX_REPORTED_DUPLICATES} more"
+            )
+    if problems:
+        raise RuntimeError(
+            "Cannot add unique constraints until duplicate rows are removed. "
+            "Keep one row per key, then restart or rerun the upgrade.\n"
+            + "\n".join(problems)
+        )
+
+    for name, table, columns in missing:
+        op.create_unique_constraint(name, table, list(columns))
+
+    for name, table, columns, using in INDEXES:
+        op.create_index(
+            name, table, list(columns), postgresql_using=using, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    for name, table, _ in UNIQUE_CONSTRAINTS:
+        op.drop_constraint(name, table, type_="unique")
@@ -0,0 +1,99 @@
+"""enum columns as varchar
+
+Tables that predate string_enum() store enums as native Postgres ENUM
+types. The models now bind plain VARCHAR, which Postgres will not compare
+with or assign to those columns, so convert them to VARCHAR(32) with the
+same CHECK constraints create_all adds.
+
+Revision ID: 590e3d2800ec
+Revises: 27c255258380
+Create Date: 2026-10-15 08:38:33.584778
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '590e3d2800ec'
+down_revision: Union[str, Sequence[str], None] = '27c255258380'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENUM_VALUES = {
+    "userrole": ("STUDENT", "FACULTY", "AUTHORITY", "ADMIN"),
+    "grievancecategory": ("INFRASTRUCTURE", "ACADEMICS", "HOSTEL", "FOOD", "OTHER"),
+    "priority": ("LOW", "MEDIUM", "HIGH", "URGENT"),
+    "grievancestatus": ("SUBMITTED", "UNDER_REVIEW", "IN_PROGRESS", "RESOLVED"),
+    "resourcetype": ("PAPER", "NOTES", "OTHER"),
+    "opportunitytype": ("RESEARCH", "INTERNSHIP"),
+    "applicationstatus": (
+        "SUBMITTED",
+        "UNDER_REVIEW",
+        "SHORTLISTED",
+        "ACCEPTED",
+        "REJECTED",
+    ),
+    "taskstatus": ("PENDING", "IN_PROGRESS", "COMPLETED"),
+}
+
+# (table, column, enum name); the CHECK constraint is named after the enum
+ENUM_COLUMNS = (
+    ("users", "role", "userrole"),
+    ("grievances", "category", "grievancecategory"),
+    ("grievances", "priority", "priority"),
+    ("grievances", "status", "grievancestatus"),
+    ("grievance_updates", "status", "grievancestatus"),
+    ("resources", "type", "resourcetype"),
+    ("opportunities", "type", "opportunitytype"),
+    ("applications", "status", "applicationstatus"),
+    ("tasks", "status", "taskstatus"),
+)
+
+
+def column_type(table: str, column: str) -> str:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_schema = current_schema() "
+            "AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    )
+    return result.scalar_one()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, enum_name in ENUM_COLUMNS:
+        if column_type(table, column) != "USER-DEFINED":
+            continue
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(32),
+            postgresql_using=f"{column}::text",
+        )
+        op.create_check_constraint(
+            enum_name, table, sa.column(column).in_(ENUM_VALUES[enum_name])
+        )
+
+    for enum_name in ENUM_VALUES:
+        op.execute(f"DROP TYPE IF EXISTS {enum_name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for enum_name, values in ENUM_VALUES.items():
+        sa.Enum(*values, name=enum_name).create(op.get_bind(), checkfirst=True)
+
+    for table, column, enum_name in ENUM_COLUMNS:
+        op.drop_constraint(enum_name, table, type_="check")
+        op.alter_column(
+            table,
+            column,
+            type_=sa.Enum(*ENUM_VALUES[enum_name], name=enum_name),
+            postgresql_using=f"{column}::{enum_name}",
+        )
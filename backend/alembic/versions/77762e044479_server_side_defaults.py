@@ -0,0 +1,78 @@
+"""server-side defaults
+
+Tables created before primary keys and timestamps moved to Postgres have
+no column defaults on them, so inserts that leave those columns to the
+server fail NOT NULL. Array columns likewise get '{}' instead of NULL.
+
+Revision ID: 77762e044479
+Revises:
+Create Date: 2026-10-15 08:36:58.678722
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77762e044479'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "users",
+    "grievances",
+    "grievance_updates",
+    "courses",
+    "enrollments",
+    "resources",
+    "calendar_events",
+    "opportunities",
+    "applications",
+    "tasks",
+)
+
+TIMESTAMP_COLUMNS = {
+    "users": ("created_at", "updated_at"),
+    "grievances": ("created_at", "updated_at"),
+    "grievance_updates": ("created_at",),
+    "courses": ("created_at", "updated_at"),
+    "enrollments": ("enrolled_at",),
+    "resources": ("created_at",),
+    "calendar_events": ("created_at",),
+    "opportunities": ("created_at", "updated_at"),
+    "applications": ("applied_at", "updated_at"),
+    "tasks": ("created_at", "updated_at"),
+}
+
+ARRAY_COLUMNS = (
+    ("grievances", "photos"),
+    ("resources", "tags"),
+    ("opportunities", "skills"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column, server_default=sa.text("timezone('utc', now())")
+            )
+    for table, column in ARRAY_COLUMNS:
+        op.alter_column(table, column, server_default=sa.text("'{}'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=None)
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(table, column, server_default=None)
+    for table, column in ARRAY_COLUMNS:
+        op.alter_column(table, column, server_default=None)
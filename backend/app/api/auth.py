@@ -3,15 +3,18 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
+from sqlalchemy.exc import IntegrityError
+from redis.exceptions import RedisError
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    averify_password,
+    aget_password_hash,
     create_access_token,
     create_refresh_token,
     verify_token,
 )
 from app.core.config import get_settings
+from app.core.token_blacklist import blacklist_token
 from app.schemas.auth import UserCreate, UserLogin, UserResponse, Token, RefreshToken
 from app.db.database import get_db
 from app.models.user import User, UserRole
@@ -20,15 +23,39 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
 settings = get_settings()
 
+# Hot lookups built once; parameters are bound per execution
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+
+STUDENT_EMAIL_SUFFIX = "@students.iitmandi.ac.in"
+STAFF_EMAIL_SUFFIX = "@iitmandi.ac.in"
+
+# Required email suffix per role; every role not listed is staff
+_ROLE_EMAIL_SUFFIX = {"STUDENT": STUDENT_EMAIL_SUFFIX}
+
+
+def token_store_unavailable() -> HTTPException:
+    """503 for when the refresh-token blacklist (Redis) is unreachable.
+
+    Token checks fail closed: refusing a refresh is safer than honouring a
+    revoked token, and 503 tells clients to retry rather than log out.
+    """
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service temporarily unavailable",
+        headers={"Retry-After": "5"},
+    )
+
 
 def is_valid_student_email(email: str) -> bool:
     """Check if email is from students domain."""
-    return email.endswith("@students.iitmandi.ac.in")
+    return email.endswith(STUDENT_EMAIL_SUFFIX)
 
 
 def is_valid_staff_email(email: str) -> bool:
     """Check if email is from staff domain."""
-    return email.endswith("@iitmandi.ac.in")
+    return email.endswith(STAFF_EMAIL_SUFFIX)
 
 
 def validate_email_for_role(email: str, role: str) -> bool:
@@ -37,10 +64,7 @@ def validate_email_for_role(email: str, role: str) -> bool:
     STUDENT: @students.iitmandi.ac.in
     FACULTY/AUTHORITY/ADMIN: @iitmandi.ac.in
     """
-    if role == "STUDENT":
-        return is_valid_student_email(email)
-    else:
-        return is_valid_staff_email(email)
+    return email.endswith(_ROLE_EMAIL_SUFFIX.get(role, STAFF_EMAIL_SUFFIX))
 
 
 @router.post(
@@ -69,18 +93,8 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
                 detail="Faculty, Authority, and Admin must use @iitmandi.ac.in email addresses",
             )
 
-    # Check if user already exists
-    result = await db.execute(select(User).where(User.email == user_data.email))
-    existing_user = result.scalar_one_or_none()
-
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-
     # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await aget_password_hash(user_data.password)
 
     # Create user
     user = User(
@@ -93,9 +107,16 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
         is_active=True,
     )
 
+    # users.email is unique, so a duplicate registration fails on commit
     db.add(user)
-    await db.commit()
-    await db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
     return UserResponse(
         id=str(user.id),
@@ -113,10 +134,12 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Authenticate user and return JWT tokens."""
     # Find user
-    result = await db.execute(select(User).where(User.email == credentials.email))
+    result = await db.execute(USER_BY_EMAIL, {"email": credentials.email})
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await averify_password(
+        credentials.password, user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -134,6 +157,7 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
         "sub": str(user.id),
         "email": user.email,
         "role": user.role.value,
+        "display_name": user.display_name,
     }
 
     access_token = create_access_token(token_data)
@@ -157,6 +181,28 @@ async def refresh_token(token_data: RefreshToken, db: AsyncSession = Depends(get
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Refresh tokens are single-use: blacklisting this one's jti before
+    # issuing a new pair rejects replays, and concurrent reuse, with 401.
+    # Tokens without a jti (access tokens, refresh tokens from before
+    # rotation) could never be revoked, so they are refused outright.
+    jti: Optional[str] = payload.get("jti")
+    if not jti or not payload.get("exp"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        first_use = await blacklist_token(jti, payload["exp"])
+    except RedisError:
+        raise token_store_unavailable()
+    if not first_use:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     user_id: Optional[str] = payload.get("sub")
     if not user_id:
         raise HTTPException(
@@ -166,7 +212,7 @@ async def refresh_token(token_data: RefreshToken, db: AsyncSession = Depends(get
         )
 
     # Get user from database
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(USER_BY_ID, {"user_id": user_id})
     user = result.scalar_one_or_none()
 
     if not user or not user.is_active:
@@ -181,6 +227,7 @@ async def refresh_token(token_data: RefreshToken, db: AsyncSession = Depends(get
         "sub": str(user.id),
         "email": user.email,
         "role": user.role.value,
+        "display_name": user.display_name,
     }
 
     access_token = create_access_token(token_data)
@@ -195,6 +242,16 @@ async def refresh_token(token_data: RefreshToken, db: AsyncSession = Depends(get
 @router.post("/logout")
 async def logout(token_data: RefreshToken):
     """Logout user by blacklisting refresh token."""
-    # In a production system, you would add the token to a Redis blacklist
-    # For now, we'll just return success as client-side should clear cookies
+    payload = verify_token(token_data.refresh_token)
+    if not payload or not payload.get("jti") or not payload.get("exp"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        await blacklist_token(payload["jti"], payload["exp"])
+    except RedisError:
+        raise token_store_unavailable()
+
     return {"message": "Successfully logged out"}
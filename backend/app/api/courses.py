@@ -2,10 +2,11 @@ from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, desc, func
+from sqlalchemy.exc import IntegrityError
+from app.core.cache import TTLCache
 from app.core.deps import get_current_user
-from app.db.database import get_db
+from app.db.database import get_db, iso_timestamp
 from app.models.academic import (
     Course,
     Enrollment,
@@ -19,6 +20,19 @@ import uuid
 
 router = APIRouter(prefix="/courses", tags=["Academics"])
 
+# Role values compared against current_user["role"] on every request
+STUDENT = UserRole.STUDENT.value
+FACULTY = UserRole.FACULTY.value
+ADMIN = UserRole.ADMIN.value
+# Roles that can hold course enrollments
+ENROLLABLE_ROLES = (STUDENT, FACULTY)
+RESOURCE_TYPES = [t.value for t in ResourceType]
+
+# Short-lived response caches for the most-read pages. Course lists are
+# per-user (is_enrolled) and are cleared when courses or enrollments change.
+course_list_cache = TTLCache(ttl=30)
+calendar_cache = TTLCache(ttl=30)
+
 
 # Schemas
 class CourseResponse(BaseModel):
@@ -103,6 +117,50 @@ class CalendarEventResponse(BaseModel):
         from_attributes = True
 
 
+def course_with_enrollment_stats(user_id: str):
+    """Select course columns with professor name, enrollment count and
+    whether ``user_id`` is enrolled."""
+    return (
+        select(
+            Course.id,
+            Course.code,
+            Course.name,
+            Course.credits,
+            Course.semester,
+            Course.department,
+            Course.description,
+            Course.professor_id,
+            User.display_name.label("professor_name"),
+            func.count(Enrollment.id).label("enrollment_count"),
+            func.coalesce(
+                func.bool_or(Enrollment.student_id == user_id), False
+            ).label("is_enrolled"),
+            iso_timestamp(Course.created_at),
+        )
+        .outerjoin(User, User.id == Course.professor_id)
+        .outerjoin(Enrollment, Enrollment.course_id == Course.id)
+        .group_by(Course.id, User.id)
+    )
+
+
+def build_course_response(row, can_enroll: bool) -> CourseResponse:
+    """Build a course response from a course_with_enrollment_stats row."""
+    return CourseResponse.model_construct(
+        id=str(row.id),
+        code=row.code,
+        name=row.name,
+        credits=row.credits,
+        semester=row.semester,
+        department=row.department,
+        description=row.description,
+        professor_id=str(row.professor_id) if row.professor_id else None,
+        professor_name=row.professor_name,
+        enrollment_count=row.enrollment_count,
+        is_enrolled=can_enroll and bool(row.is_enrolled),
+        created_at=row.created_at,
+    )
+
+
 @router.get("/", response_model=List[CourseResponse])
 async def list_courses(
     department: Optional[str] = None,
@@ -113,7 +171,21 @@ async def list_courses(
     db: AsyncSession = Depends(get_db),
 ):
     """List all courses with optional filters."""
-    query = select(Course).options(selectinload(Course.professor))
+    cache_key = (
+        current_user["id"],
+        current_user["role"],
+        department,
+        semester,
+        skip,
+        limit,
+    )
+    cached = course_list_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Count enrollments and check the caller's enrollment in the same query
+    # instead of issuing two extra SELECTs per course.
+    query = course_with_enrollment_stats(current_user["id"])
 
     if department:
         query = query.where(Course.department == department)
@@ -121,46 +193,14 @@ async def list_courses(
         query = query.where(Course.semester == semester)
 
     result = await db.execute(query.offset(skip).limit(limit))
-    courses = result.scalars().all()
 
-    response_list = []
-    for course in courses:
-        # Get enrollment count
-        enrollment_result = await db.execute(
-            select(Enrollment).where(Enrollment.course_id == course.id)
-        )
-        enrollment_count = len(enrollment_result.scalars().all())
-
-        # Check if current user is enrolled
-        is_enrolled = False
-        if current_user["role"] in [UserRole.STUDENT.value, UserRole.FACULTY.value]:
-             user_enrollment = await db.execute(
-                select(Enrollment).where(
-                    (Enrollment.student_id == current_user["id"])
-                    & (Enrollment.course_id == course.id)
-                )
-            )
-             is_enrolled = user_enrollment.scalar_one_or_none() is not None
-
-        response_list.append(
-            CourseResponse(
-                id=str(course.id),
-                code=course.code,
-                name=course.name,
-                credits=course.credits,
-                semester=course.semester,
-                department=course.department,
-                description=course.description,
-                professor_id=str(course.professor_id) if course.professor_id else None,
-                professor_name=course.professor.display_name
-                if course.professor
-                else None,
-                enrollment_count=enrollment_count,
-                is_enrolled=is_enrolled,
-                created_at=course.created_at.isoformat(),
-            )
-        )
+    can_enroll = current_user["role"] in ENROLLABLE_ROLES
 
+    response_list = [
+        build_course_response(row, can_enroll) for row in result
+    ]
+
+    course_list_cache.set(cache_key, response_list)
     return response_list
 
 
@@ -172,20 +212,12 @@ async def create_course(
 ):
     """Create a new course (faculty/admin only)."""
     # Only faculty and admin can create courses
-    if current_user["role"] not in [UserRole.FACULTY.value, UserRole.ADMIN.value]:
+    if current_user["role"] not in (FACULTY, ADMIN):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only faculty or admin can create courses",
         )
 
-    # Check if course code already exists
-    result = await db.execute(select(Course).where(Course.code == course_data.code))
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Course code already exists",
-        )
-
     # Create course
     course = Course(
         code=course_data.code,
@@ -195,24 +227,21 @@ async def create_course(
         department=course_data.department,
         description=course_data.description,
         professor_id=current_user["id"]
-        if current_user["role"] == UserRole.FACULTY.value
+        if current_user["role"] == FACULTY
         else None,
     )
 
+    # courses.code is unique, so a duplicate code fails on commit
     db.add(course)
-    await db.commit()
-    await db.refresh(course)
-
-    # Check if current user is enrolled
-    is_enrolled = False
-    if current_user["role"] in [UserRole.STUDENT.value, UserRole.FACULTY.value]:
-        user_enrollment = await db.execute(
-            select(Enrollment).where(
-                (Enrollment.student_id == current_user["id"])
-                & (Enrollment.course_id == course.id)
-            )
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Course code already exists",
         )
-        is_enrolled = user_enrollment.scalar_one_or_none() is not None
+    course_list_cache.clear()
 
     return CourseResponse(
         id=str(course.id),
@@ -236,24 +265,32 @@ async def list_my_enrollments(
 ):
     """List current user's course enrollments."""
     result = await db.execute(
-        select(Enrollment)
-        .options(selectinload(Enrollment.course))
+        select(
+            Enrollment.id,
+            Enrollment.course_id,
+            Course.name.label("course_name"),
+            Course.code.label("course_code"),
+            Enrollment.semester,
+            Enrollment.attendance_count,
+            Enrollment.total_classes,
+            iso_timestamp(Enrollment.enrolled_at),
+        )
+        .join(Course, Course.id == Enrollment.course_id)
         .where(Enrollment.student_id == current_user["id"])
     )
-    enrollments = result.scalars().all()
 
     return [
-        EnrollmentResponse(
-            id=str(enrollment.id),
-            course_id=str(enrollment.course_id),
-            course_name=enrollment.course.name,
-            course_code=enrollment.course.code,
-            semester=enrollment.semester,
-            attendance_count=enrollment.attendance_count,
-            total_classes=enrollment.total_classes,
-            enrolled_at=enrollment.enrolled_at.isoformat() if enrollment.enrolled_at else None,
+        EnrollmentResponse.model_construct(
+            id=str(row.id),
+            course_id=str(row.course_id),
+            course_name=row.course_name,
+            course_code=row.course_code,
+            semester=row.semester,
+            attendance_count=row.attendance_count,
+            total_classes=row.total_classes,
+            enrolled_at=row.enrolled_at,
         )
-        for enrollment in enrollments
+        for row in result
     ]
 
 
@@ -265,13 +302,13 @@ async def get_course(
 ):
     """Get a specific course by ID (enrolled students, professor, or admin only)."""
     result = await db.execute(
-        select(Course)
-        .options(selectinload(Course.professor))
-        .where(Course.id == course_id)
+        course_with_enrollment_stats(current_user["id"]).where(
+            Course.id == course_id
+        )
     )
-    course = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not course:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found",
@@ -302,39 +339,10 @@ async def get_course(
         #         detail="You must be enrolled in this course to view details",
         #     )
 
-        # Get enrollment count
-        enrollment_result = await db.execute(
-            select(Enrollment).where(Enrollment.course_id == course.id)
-        )
-        enrollment_count = len(enrollment_result.scalars().all())
-
-        # Check if current user is enrolled
-        is_enrolled = False
-        if current_user["role"] in [UserRole.STUDENT.value, UserRole.FACULTY.value]:
-             user_enrollment = await db.execute(
-                select(Enrollment).where(
-                    (Enrollment.student_id == current_user["id"])
-                    & (Enrollment.course_id == course.id)
-                )
-            )
-             is_enrolled = user_enrollment.scalar_one_or_none() is not None
-
-        return CourseResponse(
-            id=str(course.id),
-            code=str(course.code),
-            name=str(course.name),
-            credits=course.credits,
-            semester=str(course.semester),
-            department=str(course.department),
-            description=str(course.description) if course.description else None,
-            professor_id=str(course.professor_id) if course.professor_id else None,
-            professor_name=str(course.professor.display_name) if course.professor else None,
-            enrollment_count=enrollment_count,
-            is_enrolled=is_enrolled,
-            created_at=course.created_at.isoformat()
-            if hasattr(course.created_at, "isoformat")
-            else str(course.created_at),
-        )
+        # Only students and faculty can be enrolled
+        can_enroll = current_user["role"] in ENROLLABLE_ROLES
+
+        return build_course_response(row, can_enroll)
     except Exception as e:
         print(f"Error in get_course: {e}")
         import traceback
@@ -353,7 +361,7 @@ async def enroll_in_course(
 ):
     """Enroll current user in a course."""
     # Valid roles: Student and Faculty
-    if current_user["role"] not in [UserRole.STUDENT.value, UserRole.FACULTY.value]:
+    if current_user["role"] not in ENROLLABLE_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only students and faculty can enroll in courses",
@@ -369,19 +377,6 @@ async def enroll_in_course(
             detail="Course not found",
         )
 
-    # Check if already enrolled
-    result = await db.execute(
-        select(Enrollment).where(
-            (Enrollment.student_id == current_user["id"])
-            & (Enrollment.course_id == course_id)
-        )
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Already enrolled in this course",
-        )
-
     # Create enrollment
     enrollment = Enrollment(
         student_id=current_user["id"],
@@ -391,8 +386,17 @@ async def enroll_in_course(
         total_classes=0,
     )
 
+    # uq_enrollment_student_course makes a repeat enrollment fail on commit
     db.add(enrollment)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Already enrolled in this course",
+        )
+    course_list_cache.clear()
 
     return {"message": "Successfully enrolled in course"}
 
@@ -406,8 +410,20 @@ async def list_course_resources(
 ):
     """List resources for a course."""
     query = (
-        select(Resource)
-        .options(selectinload(Resource.uploader))
+        select(
+            Resource.id,
+            Resource.course_id,
+            Resource.title,
+            Resource.type,
+            Resource.year,
+            Resource.exam_type,
+            Resource.file_path,
+            Resource.tags,
+            Resource.downloads,
+            User.display_name.label("uploader_name"),
+            iso_timestamp(Resource.created_at),
+        )
+        .outerjoin(User, User.id == Resource.uploader_id)
         .where(Resource.course_id == course_id)
     )
 
@@ -419,25 +435,22 @@ async def list_course_resources(
             pass
 
     result = await db.execute(query.order_by(desc(Resource.created_at)))
-    resources = result.scalars().all()
 
     return [
-        ResourceResponse(
-            id=str(resource.id),
-            course_id=str(resource.course_id),
-            title=resource.title,
-            type=resource.type.value,
-            year=resource.year,
-            exam_type=resource.exam_type,
-            file_path=resource.file_path,
-            tags=resource.tags or [],
-            downloads=resource.downloads,
-            uploader_name=resource.uploader.display_name
-            if resource.uploader
-            else "Unknown",
-            created_at=resource.created_at.isoformat(),
+        ResourceResponse.model_construct(
+            id=str(row.id),
+            course_id=str(row.course_id),
+            title=row.title,
+            type=row.type.value,
+            year=row.year,
+            exam_type=row.exam_type,
+            file_path=row.file_path,
+            tags=row.tags or [],
+            downloads=row.downloads,
+            uploader_name=row.uploader_name or "Unknown",
+            created_at=row.created_at,
         )
-        for resource in resources
+        for row in result
     ]
 
 
@@ -462,7 +475,7 @@ async def create_resource(
     # Only course professor or admin can upload resources
     if (
         str(course.professor_id) != current_user["id"]
-        and current_user["role"] != UserRole.ADMIN.value
+        and current_user["role"] != ADMIN
     ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -475,7 +488,7 @@ async def create_resource(
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid resource type. Must be one of: {[t.value for t in ResourceType]}",
+            detail=f"Invalid resource type. Must be one of: {RESOURCE_TYPES}",
         )
 
     # Create resource
@@ -492,13 +505,6 @@ async def create_resource(
 
     db.add(resource)
     await db.commit()
-    await db.refresh(resource)
-
-    # Get uploader
-    uploader_result = await db.execute(
-        select(User).where(User.id == resource.uploader_id)
-    )
-    uploader = uploader_result.scalar_one_or_none()
 
     return ResourceResponse(
         id=str(resource.id),
@@ -512,7 +518,8 @@ async def create_resource(
         file_path=str(resource.file_path) if resource.file_path else None,
         tags=list(resource.tags) if resource.tags else [],
         downloads=resource.downloads,
-        uploader_name=str(uploader.display_name) if uploader else "Unknown",
+        # The uploader is the caller, whose name is carried in the token
+        uploader_name=current_user["display_name"] or "Unknown",
         created_at=resource.created_at.isoformat(),
     )
 
@@ -524,26 +531,38 @@ async def list_course_calendar(
     db: AsyncSession = Depends(get_db),
 ):
     """List calendar events for a course."""
+    cached = calendar_cache.get(course_id)
+    if cached is not None:
+        return cached
+
     result = await db.execute(
-        select(CalendarEvent)
+        select(
+            CalendarEvent.id,
+            CalendarEvent.course_id,
+            CalendarEvent.title,
+            CalendarEvent.description,
+            CalendarEvent.event_type,
+            iso_timestamp(CalendarEvent.start_date),
+            iso_timestamp(CalendarEvent.end_date),
+            CalendarEvent.created_by,
+        )
         .where(CalendarEvent.course_id == course_id)
         .order_by(CalendarEvent.start_date)
     )
-    events = result.scalars().all()
 
-    return [
-        CalendarEventResponse(
-            id=str(event.id),
-            course_id=str(event.course_id) if event.course_id else None,
-            title=event.title,
-            description=event.description,
-            event_type=event.event_type,
-            start_date=event.start_date.isoformat(),
-            end_date=event.end_date.isoformat() if event.end_date else None,
-            created_by=str(event.created_by),
+    events = [
+        CalendarEventResponse.model_construct(
+            id=str(row.id),
+            course_id=str(row.course_id) if row.course_id else None,
+            title=row.title,
+            description=row.description,
+            event_type=row.event_type,
+            start_date=row.start_date,
+            end_date=row.end_date,
+            created_by=str(row.created_by),
         )
-        for event in events
+        for row in result
     ]
 
-
-
+    calendar_cache.set(course_id, events)
+    return events
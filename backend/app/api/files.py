@@ -1,22 +1,39 @@
+import asyncio
+import mimetypes
 import os
 import uuid
-from pathlib import Path
+from email.utils import formatdate, parsedate_to_datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    UploadFile,
+    File,
+    status,
+)
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func
 
 from app.core.deps import get_current_user
+from app.core.http_cache import etag_matches, not_modified
 from app.core.storage import (
     get_file_path,
     is_allowed_file,
+    has_valid_signature,
     validate_file_size,
+    save_upload,
+    make_thumbnail,
+    ImageTooLargeError,
+    AVATAR_THUMBNAIL_SIZE,
     GRIEVANCE_PHOTOS_DIR,
     COURSE_RESOURCES_DIR,
     OPPORTUNITY_APPLICATIONS_DIR,
     USER_AVATARS_DIR,
     UPLOAD_DIR,
+    ACCEL_REDIRECT_PREFIX,
 )
 from app.db.database import get_db
 from app.models.user import User, UserRole
@@ -26,25 +43,82 @@ from app.models.opportunity import Application
 
 router = APIRouter(prefix="/files", tags=["Files"])
 
+# Uploads are stored under fresh UUID names and never rewritten, except
+# avatars which are saved as <user_id>.<ext> and replaced in place
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+AVATAR_EXTENSIONS: frozenset[str] = frozenset({".jpg", ".jpeg", ".png", ".gif"})
+FILE_TYPE_NOT_ALLOWED_DETAIL = (
+    "File type not allowed. Allowed: "
+    ".pdf, .doc, .docx, .jpg, .jpeg, .png, .gif, .mp4, .zip"
+)
+SIGNATURE_MISMATCH_DETAIL = "File contents do not match its extension"
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def is_body_too_large(request: Request) -> bool:
+    """Reject from Content-Length alone when the file can't fit the limit.
+
+    The body also carries multipart boundaries, part headers and small form
+    fields, allowed for by MULTIPART_OVERHEAD.
+    """
+    content_length = request.headers.get("content-length", "")
+    return content_length.isdigit() and not validate_file_size(
+        int(content_length) - MULTIPART_OVERHEAD
+    )
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Check the request's conditional headers against the file's validators."""
+    if "if-none-match" in request.headers:
+        return etag_matches(request, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+
+    return False
+
 
 @router.post("/grievances/{grievance_id}/photos")
 async def upload_grievance_photo(
     grievance_id: str,
+    request: Request,
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Upload a photo for a grievance."""
     # Validate file
+    if is_body_too_large(request):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File too large. Max size: 10MB",
+        )
+
     if not is_allowed_file(file.filename):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed: {'.pdf, .doc, .docx, .jpg, .jpeg, .png, .gif, .mp4, .zip'}",
+            detail=FILE_TYPE_NOT_ALLOWED_DETAIL,
+        )
+
+    ext = os.path.splitext(file.filename)[1].lower()
+    if not await has_valid_signature(file, ext):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=SIGNATURE_MISMATCH_DETAIL,
         )
 
     # Check grievance ownership
-    result = await db.execute(select(Grievance).where(Grievance.id == grievance_id))
-    grievance = result.scalar_one_or_none()
+    result = await db.execute(
+        select(Grievance.submitter_id).where(Grievance.id == grievance_id)
+    )
+    grievance = result.first()
 
     if not grievance:
         raise HTTPException(
@@ -58,25 +132,26 @@ async def upload_grievance_photo(
         )
 
     # Generate unique filename
-    ext = Path(file.filename).suffix
-    filename = f"{uuid.uuid4()}{ext}"
+    filename = f"{uuid.uuid4().hex}{ext}"
     file_path = GRIEVANCE_PHOTOS_DIR / filename
 
     # Save file
-    content = await file.read()
-    if not validate_file_size(len(content)):
+    if not await save_upload(file, file_path):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Max size: 10MB",
+            detail="File too large. Max size: 10MB",
         )
 
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    # Update grievance photos array
-    if not grievance.photos:
-        grievance.photos = []
-    grievance.photos.append(f"/uploads/grievances/{filename}")
+    # Append to the grievance photos array in place
+    await db.execute(
+        update(Grievance)
+        .where(Grievance.id == grievance_id)
+        .values(
+            photos=func.array_append(
+                Grievance.photos, f"/uploads/grievances/{filename}"
+            )
+        )
+    )
     await db.commit()
 
     return {
@@ -89,6 +164,7 @@ async def upload_grievance_photo(
 @router.post("/courses/{course_id}/resources")
 async def upload_course_resource(
     course_id: str,
+    request: Request,
     file: UploadFile = File(...),
     title: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
@@ -96,9 +172,21 @@ async def upload_course_resource(
 ):
     """Upload a resource file for a course (professor only)."""
     # Validate file
+    if is_body_too_large(request):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="File too large"
+        )
+
     if not is_allowed_file(file.filename):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=f"File type not allowed"
+            status_code=status.HTTP_400_BAD_REQUEST, detail="File type not allowed"
+        )
+
+    ext = os.path.splitext(file.filename)[1].lower()
+    if not await has_valid_signature(file, ext):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=SIGNATURE_MISMATCH_DETAIL,
         )
 
     # Check course ownership
@@ -120,20 +208,15 @@ async def upload_course_resource(
         )
 
     # Generate unique filename
-    ext = Path(file.filename).suffix
-    filename = f"{uuid.uuid4()}{ext}"
+    filename = f"{uuid.uuid4().hex}{ext}"
     file_path = COURSE_RESOURCES_DIR / filename
 
     # Save file
-    content = await file.read()
-    if not validate_file_size(len(content)):
+    if not await save_upload(file, file_path):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="File too large"
         )
 
-    with open(file_path, "wb") as f:
-        f.write(content)
-
     # Create resource record
     resource = Resource(
         course_id=course_id,
@@ -158,25 +241,31 @@ async def upload_course_resource(
 async def upload_application_resume(
     opportunity_id: str,
     application_id: str,
+    request: Request,
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Upload resume for an application (PDF only)."""
+    if is_body_too_large(request):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="File too large"
+        )
+
     # Validate file type (resumes should be PDF)
-    ext = Path(file.filename).suffix.lower()
-    if ext != ".pdf":
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext != ".pdf" or not await has_valid_signature(file, ext):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Resume must be a PDF file"
         )
 
     # Check application ownership
     result = await db.execute(
-        select(Application)
+        select(Application.student_id)
         .where(Application.id == application_id)
         .where(Application.opportunity_id == opportunity_id)
     )
-    application = result.scalar_one_or_none()
+    application = result.first()
 
     if not application:
         raise HTTPException(
@@ -190,21 +279,21 @@ async def upload_application_resume(
         )
 
     # Generate unique filename
-    filename = f"{uuid.uuid4()}.pdf"
+    filename = f"{uuid.uuid4().hex}.pdf"
     file_path = OPPORTUNITY_APPLICATIONS_DIR / filename
 
     # Save file
-    content = await file.read()
-    if not validate_file_size(len(content)):
+    if not await save_upload(file, file_path):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="File too large"
         )
 
-    with open(file_path, "wb") as f:
-        f.write(content)
-
     # Update application
-    application.resume_path = f"/uploads/opportunities/{filename}"
+    await db.execute(
+        update(Application)
+        .where(Application.id == application_id)
+        .values(resume_path=f"/uploads/opportunities/{filename}")
+    )
     await db.commit()
 
     return {
@@ -216,15 +305,20 @@ async def upload_application_resume(
 
 @router.post("/users/avatar")
 async def upload_avatar(
+    request: Request,
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Upload user avatar (image files only)."""
+    if is_body_too_large(request):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="File too large"
+        )
+
     # Validate file type
-    ext = Path(file.filename).suffix.lower()
-    allowed = {".jpg", ".jpeg", ".png", ".gif"}
-    if ext not in allowed:
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext not in AVATAR_EXTENSIONS or not await has_valid_signature(file, ext):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Avatar must be an image file (jpg, png, gif)",
@@ -235,21 +329,33 @@ async def upload_avatar(
     file_path = USER_AVATARS_DIR / filename
 
     # Save file
-    content = await file.read()
-    if not validate_file_size(len(content)):
+    if not await save_upload(file, file_path):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="File too large"
         )
 
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Serve a small WebP variant; fall back to the original if the upload
+    # can't be decoded as an image
+    try:
+        thumb_path = await asyncio.to_thread(
+            make_thumbnail, file_path, AVATAR_THUMBNAIL_SIZE
+        )
+    except ImageTooLargeError:
+        await asyncio.to_thread(file_path.unlink, missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Avatar image dimensions too large",
+        )
+    if thumb_path:
+        filename = thumb_path.name
 
     # Update user avatar_url
-    result = await db.execute(select(User).where(User.id == current_user["id"]))
-    user = result.scalar_one_or_none()
-    if user:
-        user.avatar_url = f"/uploads/avatars/{filename}"
-        await db.commit()
+    await db.execute(
+        update(User)
+        .where(User.id == current_user["id"])
+        .values(avatar_url=f"/uploads/avatars/{filename}")
+    )
+    await db.commit()
 
     return {
         "message": "Avatar uploaded successfully",
@@ -258,7 +364,7 @@ async def upload_avatar(
 
 
 @router.get("/uploads/{file_path:path}")
-async def serve_file(file_path: str):
+async def serve_file(file_path: str, request: Request):
     """Serve uploaded files."""
     full_path = UPLOAD_DIR / file_path
 
@@ -270,9 +376,31 @@ async def serve_file(file_path: str):
             status_code=status.HTTP_403_FORBIDDEN, detail="Invalid file path"
         )
 
-    if not full_path.exists():
+    if not full_path.is_file():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
         )
 
-    return FileResponse(full_path)
+    stat = full_path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Cache-Control": REVALIDATE_CACHE_CONTROL
+        if full_path.is_relative_to(USER_AVATARS_DIR)
+        else IMMUTABLE_CACHE_CONTROL,
+    }
+
+    if is_not_modified(request, etag, stat.st_mtime):
+        return not_modified(headers)
+
+    # Hand the transfer to the reverse proxy when one is configured
+    if ACCEL_REDIRECT_PREFIX:
+        media_type, _ = mimetypes.guess_type(full_path.name)
+        headers["X-Accel-Redirect"] = f"{ACCEL_REDIRECT_PREFIX}{file_path}"
+        return Response(
+            headers=headers,
+            media_type=media_type or "application/octet-stream",
+        )
+
+    return FileResponse(full_path, stat_result=stat, headers=headers)
@@ -1,9 +1,11 @@
+import base64
 from datetime import datetime
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from typing import Optional, List, Dict, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, tuple_
 from sqlalchemy.orm import selectinload
+from app.core.cache import TTLCache
 from app.core.deps import get_current_user
 from app.db.database import get_db
 from app.models.grievance import (
@@ -19,6 +21,13 @@ import uuid
 
 router = APIRouter(prefix="/grievances", tags=["Grievances"])
 
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# The same authority/admin users author most updates, so their names are
+# cached briefly across requests
+user_name_cache = TTLCache(ttl=60, maxsize=2048)
+
 
 # Schemas
 class GrievanceCreate(BaseModel):
@@ -66,72 +75,106 @@ class GrievanceResponse(BaseModel):
         from_attributes = True
 
 
-async def get_user_name(db: AsyncSession, user_id: str) -> Optional[str]:
-    """Helper to get user display name."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    return user.display_name or user.email if user else None
+def encode_cursor(grievance: Grievance) -> str:
+    """Encode a grievance's (created_at, id) sort key as an opaque cursor."""
+    raw = f"{grievance.created_at.isoformat()}|{grievance.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        created_at, grievance_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), uuid.UUID(grievance_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+async def get_user_names(
+    db: AsyncSession, grievances: List[Grievance]
+) -> Dict[str, str]:
+    """Look up names for all submitters and updaters of grievances.
+
+    Names are served from user_name_cache where possible; the rest are
+    fetched in one query.
+    """
+    user_ids = {
+        str(g.submitter_id)
+        for g in grievances
+        if g.submitter_id and not g.is_anonymous
+    }
+    user_ids.update(str(update.updated_by) for g in grievances for update in g.updates)
+
+    user_names = {}
+    missing = []
+    for user_id in user_ids:
+        name = user_name_cache.get(user_id)
+        if name is None:
+            missing.append(user_id)
+        else:
+            user_names[user_id] = name
+
+    if missing:
+        result = await db.execute(
+            select(User.id, User.display_name, User.email).where(
+                User.id.in_(missing)
+            )
+        )
+        for row in result:
+            name = row.display_name or row.email
+            user_names[str(row.id)] = name
+            user_name_cache.set(str(row.id), name)
+    return user_names
 
 
-async def build_grievance_response(
-    grievance: Grievance, db: AsyncSession
+def build_grievance_response(
+    grievance: Grievance, user_names: Dict[str, str]
 ) -> GrievanceResponse:
-    """Build grievance response with all related data."""
+    """Build grievance response with all related data.
+
+    ``user_names`` maps user ids to names, as returned by get_user_names.
+    Every field comes from the database, so validation is skipped.
+    """
     # Get submitter name
     submitter_name = None
     if grievance.submitter_id and not grievance.is_anonymous:
-        submitter_name = await get_user_name(db, str(grievance.submitter_id))
+        submitter_name = user_names.get(str(grievance.submitter_id))
 
     # Build updates response
     updates_response = []
     for update in grievance.updates:
-        updater_name = await get_user_name(db, str(update.updated_by))
+        updater_name = user_names.get(str(update.updated_by))
         updater_info = {"id": str(update.updated_by), "name": updater_name or "Unknown"}
 
         updates_response.append(
-            GrievanceUpdateResponse(
+            GrievanceUpdateResponse.model_construct(
                 id=str(update.id),
-                status=update.status.value
-                if hasattr(update.status, "value")
-                else str(update.status),
+                status=update.status.value,
                 remark=update.remark,
-                created_at=update.created_at.isoformat()
-                if hasattr(update.created_at, "isoformat")
-                else str(update.created_at),
+                created_at=update.created_at.isoformat(),
                 updated_by=updater_info,
             )
         )
 
-    return GrievanceResponse(
+    return GrievanceResponse.model_construct(
         id=str(grievance.id),
-        title=str(grievance.title),
-        description=str(grievance.description),
-        category=str(
-            grievance.category.value
-            if hasattr(grievance.category, "value")
-            else grievance.category
-        ),
-        priority=str(
-            grievance.priority.value
-            if hasattr(grievance.priority, "value")
-            else grievance.priority
-        ),
-        location=str(grievance.location),
-        status=str(
-            grievance.status.value
-            if hasattr(grievance.status, "value")
-            else grievance.status
-        ),
-        is_anonymous=bool(grievance.is_anonymous),
+        title=grievance.title,
+        description=grievance.description,
+        category=grievance.category.value,
+        priority=grievance.priority.value,
+        location=grievance.location,
+        status=grievance.status.value,
+        is_anonymous=grievance.is_anonymous,
         submitter_id=str(grievance.submitter_id) if grievance.submitter_id else None,
         submitter_name=submitter_name,
         assigned_to=str(grievance.assigned_to) if grievance.assigned_to else None,
-        created_at=grievance.created_at.isoformat()
-        if hasattr(grievance.created_at, "isoformat")
-        else str(grievance.created_at),
-        updated_at=grievance.updated_at.isoformat()
-        if hasattr(grievance.updated_at, "isoformat")
-        else str(grievance.updated_at),
+        created_at=grievance.created_at.isoformat(),
+        updated_at=grievance.updated_at.isoformat(),
         updates=updates_response,
     )
 
@@ -153,7 +196,7 @@ async def create_grievance(
             detail=f"Invalid category or priority: {str(e)}",
         )
 
-    # Create grievance
+    # Create grievance together with its initial update, in one transaction
     grievance = Grievance(
         title=grievance_data.title,
         description=grievance_data.description,
@@ -163,48 +206,52 @@ async def create_grievance(
         status=GrievanceStatus.SUBMITTED,
         is_anonymous=grievance_data.is_anonymous,
         submitter_id=None if grievance_data.is_anonymous else current_user["id"],
+        updates=[
+            GrievanceUpdate(
+                updated_by=current_user["id"],
+                status=GrievanceStatus.SUBMITTED,
+                remark="Grievance submitted",
+            )
+        ],
     )
 
     db.add(grievance)
     await db.commit()
 
-    # Create initial update
-    update = GrievanceUpdate(
-        grievance_id=grievance.id,
-        updated_by=current_user["id"],
-        status=GrievanceStatus.SUBMITTED,
-        remark="Grievance submitted",
-    )
-    db.add(update)
-    await db.commit()
-
-    # Reload grievance with updates eagerly loaded
-    result = await db.execute(
-        select(Grievance)
-        .options(selectinload(Grievance.updates))
-        .where(Grievance.id == grievance.id)
-    )
-    grievance = result.scalar_one()
-
-    return await build_grievance_response(grievance, db)
+    # The caller is the only submitter/updater, so no name lookup is needed
+    user_names = {
+        current_user["id"]: current_user["display_name"] or current_user["email"]
+    }
+    return build_grievance_response(grievance, user_names)
 
 
 @router.get("/", response_model=List[GrievanceResponse])
 async def list_grievances(
+    response: Response,
     status: Optional[str] = None,
     category: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = MAX_PAGE_SIZE,
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List grievances with optional filters."""
+    """List grievances with optional filters, newest first.
+
+    Pages are keyed on (created_at, id). When more results exist, the cursor
+    for the next page is returned in the X-Next-Cursor response header.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     query = (
         select(Grievance)
         .options(selectinload(Grievance.updates))
-        .order_by(desc(Grievance.created_at))
+        .order_by(desc(Grievance.created_at), desc(Grievance.id))
     )
 
+    if cursor:
+        query = query.where(
+            tuple_(Grievance.created_at, Grievance.id) < decode_cursor(cursor)
+        )
+
     # Apply filters
     if status:
         try:
@@ -227,14 +274,16 @@ async def list_grievances(
             | (Grievance.is_anonymous == True)
         )
 
-    result = await db.execute(query.offset(skip).limit(limit))
+    result = await db.execute(query.limit(limit))
     grievances = result.scalars().all()
 
-    response_list = []
-    for grievance in grievances:
-        response_list.append(await build_grievance_response(grievance, db))
+    if len(grievances) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(grievances[-1])
 
-    return response_list
+    user_names = await get_user_names(db, grievances)
+    return [
+        build_grievance_response(grievance, user_names) for grievance in grievances
+    ]
 
 
 @router.get("/{grievance_id}", response_model=GrievanceResponse)
@@ -268,7 +317,8 @@ async def get_grievance(
                 detail="Not authorized to view this grievance",
             )
 
-    return await build_grievance_response(grievance, db)
+    user_names = await get_user_names(db, [grievance])
+    return build_grievance_response(grievance, user_names)
 
 
 @router.post("/{grievance_id}/updates", response_model=GrievanceResponse)
@@ -312,56 +362,23 @@ async def add_grievance_update(
             detail=f"Invalid status. Must be one of: {[s.value for s in GrievanceStatus]}",
         )
 
-    # Create update
-    update = GrievanceUpdate(
-        grievance_id=grievance.id,
-        updated_by=current_user["id"],
-        status=new_status,
-        remark=update_data.remark,
+    # Create update; appending through the already-loaded relationship
+    # keeps grievance.updates current, so no reload is needed afterwards
+    grievance.updates.append(
+        GrievanceUpdate(
+            updated_by=current_user["id"],
+            status=new_status,
+            remark=update_data.remark,
+        )
     )
-    db.add(update)
 
     # Update grievance status
     grievance.status = new_status
     if not grievance.assigned_to:
         grievance.assigned_to = current_user["id"]
 
+    # INSERT and UPDATE go out in a single flush and transaction
     await db.commit()
 
-    # Reload to get fresh data
-    result = await db.execute(
-        select(Grievance)
-        .options(selectinload(Grievance.updates))
-        .where(Grievance.id == grievance_id)
-    )
-    grievance = result.scalar_one()
-
-    return await build_grievance_response(grievance, db)
-
-
-@router.post("/{grievance_id}/photos")
-async def upload_grievance_photo(
-    grievance_id: str,
-    file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Upload a photo for a grievance."""
-    # Check if grievance exists and user owns it
-    result = await db.execute(select(Grievance).where(Grievance.id == grievance_id))
-    grievance = result.scalar_one_or_none()
-
-    if not grievance:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Grievance not found",
-        )
-
-    if str(grievance.submitter_id) != current_user["id"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to upload photos for this grievance",
-        )
-
-    # For now, just return success (implement file storage later)
-    return {"message": "Photo uploaded successfully", "filename": file.filename}
+    user_names = await get_user_names(db, [grievance])
+    return build_grievance_response(grievance, user_names)
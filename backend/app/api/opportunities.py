@@ -1,10 +1,18 @@
-from datetime import datetime, date
+from datetime import datetime, date, time, timezone
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, desc, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload
 from app.core.deps import get_current_user
+from app.core.http_cache import (
+    PRIVATE_REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    not_modified,
+    weak_etag,
+)
 from app.db.database import get_db
 from app.models.opportunity import (
     Opportunity,
@@ -20,6 +28,19 @@ import uuid
 
 router = APIRouter(prefix="/opportunities", tags=["Opportunities"])
 
+# Request values mapped to enum members, so validation is a dict lookup
+OPPORTUNITY_TYPES = {t.value: t for t in OpportunityType}
+APPLICATION_STATUSES = {s.value: s for s in ApplicationStatus}
+TASK_STATUSES = {s.value: s for s in TaskStatus}
+
+MAX_PAGE_SIZE = 100
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def utc_today_start() -> datetime:
+    """Midnight UTC today, naive like the stored timestamps (utc_now)."""
+    return datetime.combine(datetime.now(timezone.utc).date(), time.min)
+
 
 # Schemas
 class OpportunityCreate(BaseModel):
@@ -109,45 +130,82 @@ async def list_opportunities(
     skills: Optional[str] = None,
     is_open: Optional[bool] = True,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = MAX_PAGE_SIZE,
+    include_total: bool = False,
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all opportunities with optional filters."""
-    query = select(Opportunity).options(selectinload(Opportunity.faculty))
-
-    if is_open is not None:
-        query = query.where(Opportunity.is_open == is_open)
+    """List all opportunities with optional filters.
+
+    ``skills`` is a comma-separated list; opportunities asking for any of
+    them match.
+
+    With include_total, the number of matching opportunities is returned in
+    the X-Total-Count header.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    # Plain column rows: no ORM instances or identity map for a read-only list
+    query = select(
+        Opportunity.id,
+        Opportunity.title,
+        Opportunity.description,
+        Opportunity.type,
+        Opportunity.faculty_id,
+        User.display_name.label("faculty_name"),
+        Opportunity.skills,
+        Opportunity.duration,
+        Opportunity.stipend,
+        Opportunity.deadline,
+        Opportunity.is_open,
+        Opportunity.created_at,
+    ).outerjoin(User, User.id == Opportunity.faculty_id)
 
     # Filter by deadline (only show opportunities with future deadlines)
-    query = query.where(Opportunity.deadline >= date.today())
+    filters = [Opportunity.deadline >= utc_today_start()]
+    if is_open is not None:
+        filters.append(Opportunity.is_open == is_open)
+    if skills:
+        skill_list = [skill.strip() for skill in skills.split(",") if skill.strip()]
+        if skill_list:
+            filters.append(Opportunity.skills.overlap(skill_list))
+    query = query.where(*filters)
 
     result = await db.execute(
         query.order_by(desc(Opportunity.created_at)).offset(skip).limit(limit)
     )
-    opportunities = result.scalars().all()
-
-    return [
-        OpportunityResponse(
-            id=str(opp.id),
-            title=str(opp.title),
-            description=str(opp.description),
-            type=str(opp.type.value) if hasattr(opp.type, "value") else str(opp.type),
-            faculty_id=str(opp.faculty_id),
-            faculty_name=str(opp.faculty.display_name) if opp.faculty else "Unknown",
-            skills=list(opp.skills) if opp.skills else [],
-            duration=str(opp.duration),
-            stipend=str(opp.stipend) if opp.stipend else None,
-            deadline=opp.deadline.isoformat()
-            if hasattr(opp.deadline, "isoformat")
-            else str(opp.deadline),
-            is_open=bool(opp.is_open),
-            created_at=opp.created_at.isoformat()
-            if hasattr(opp.created_at, "isoformat")
-            else str(opp.created_at),
+
+    headers = None
+    if include_total:
+        # Filtered, so an exact count; served from the (is_open, ...) index
+        total = await db.execute(
+            select(func.count()).select_from(Opportunity).where(*filters)
         )
-        for opp in opportunities
-    ]
+        headers = {TOTAL_COUNT_HEADER: str(total.scalar_one())}
+
+    # Returning the response directly skips response_model validation and
+    # jsonable_encoder; the schema above still documents the shape
+    return ORJSONResponse(
+        [
+            {
+                "id": row.id,
+                "title": row.title,
+                "description": row.description,
+                "type": row.type,
+                "faculty_id": row.faculty_id,
+                "faculty_name": row.faculty_name or "Unknown",
+                "skills": row.skills or [],
+                "duration": row.duration,
+                "stipend": row.stipend or None,
+                "deadline": row.deadline,
+                "is_open": row.is_open,
+                "created_at": row.created_at,
+                "is_applied": False,
+                "application_status": None,
+            }
+            for row in result
+        ],
+        headers=headers,
+    )
 
 
 @router.post(
@@ -167,16 +225,15 @@ async def create_opportunity(
         )
 
     # Validate opportunity type
-    try:
-        opp_type = OpportunityType(opportunity_data.type)
-    except ValueError:
+    opp_type = OPPORTUNITY_TYPES.get(opportunity_data.type)
+    if opp_type is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid opportunity type. Must be one of: {[t.value for t in OpportunityType]}",
+            detail=f"Invalid opportunity type. Must be one of: {list(OPPORTUNITY_TYPES)}",
         )
 
     # Validate deadline is in the future
-    if opportunity_data.deadline < date.today():
+    if opportunity_data.deadline < datetime.now(timezone.utc).date():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Deadline must be in the future",
@@ -191,27 +248,20 @@ async def create_opportunity(
         skills=opportunity_data.skills,
         duration=opportunity_data.duration,
         stipend=opportunity_data.stipend,
-        deadline=opportunity_data.deadline,
+        deadline=datetime.combine(opportunity_data.deadline, time.min),
         is_open=True,
     )
 
     db.add(opportunity)
     await db.commit()
-    await db.refresh(opportunity)
-
-    # Get faculty name
-    faculty_result = await db.execute(
-        select(User).where(User.id == opportunity.faculty_id)
-    )
-    faculty = faculty_result.scalar_one_or_none()
 
-    return OpportunityResponse(
+    return OpportunityResponse.model_construct(
         id=str(opportunity.id),
         title=opportunity.title,
         description=opportunity.description,
         type=opportunity.type.value,
         faculty_id=str(opportunity.faculty_id),
-        faculty_name=faculty.display_name if faculty else "Unknown",
+        faculty_name=current_user["display_name"] or "Unknown",
         skills=opportunity.skills or [],
         duration=opportunity.duration,
         stipend=opportunity.stipend,
@@ -231,26 +281,33 @@ async def list_my_applications(
         result = await db.execute(
             select(Application)
             .options(
-                selectinload(Application.opportunity), selectinload(Application.student)
+                joinedload(Application.opportunity).load_only(Opportunity.title),
+                joinedload(Application.student).load_only(User.display_name),
             )
             .where(Application.student_id == current_user["id"])
             .order_by(desc(Application.applied_at))
         )
         applications = result.scalars().all()
 
-        return [
-            ApplicationResponse(
-                id=str(app.id),
-                opportunity_id=str(app.opportunity_id),
-                opportunity_title=app.opportunity.title if app.opportunity else "Unknown Opportunity",
-                student_id=str(app.student_id),
-                student_name=app.student.display_name if app.student else "Unknown",
-                status=app.status.value if hasattr(app.status, "value") else str(app.status),
-                cover_letter=app.cover_letter,
-                applied_at=app.applied_at.isoformat(),
-            )
-            for app in applications
-        ]
+        return ORJSONResponse(
+            [
+                {
+                    "id": app.id,
+                    "opportunity_id": app.opportunity_id,
+                    "opportunity_title": app.opportunity.title
+                    if app.opportunity
+                    else "Unknown Opportunity",
+                    "student_id": app.student_id,
+                    "student_name": app.student.display_name
+                    if app.student
+                    else "Unknown",
+                    "status": app.status,
+                    "cover_letter": app.cover_letter,
+                    "applied_at": app.applied_at,
+                }
+                for app in applications
+            ]
+        )
     except Exception as e:
         print(f"Error in list_my_applications: {e}")
         import traceback
@@ -269,33 +326,42 @@ async def list_my_tasks(
     db: AsyncSession = Depends(get_db),
 ):
     """List current user's tasks."""
-    query = select(Task).where(Task.student_id == current_user["id"])
-
-    if status:
-        try:
-            task_status = TaskStatus(status)
-            query = query.where(Task.status == task_status)
-        except ValueError:
-            pass
+    query = select(
+        Task.id,
+        Task.student_id,
+        Task.title,
+        Task.description,
+        Task.category,
+        Task.deadline,
+        Task.status,
+        Task.progress,
+        Task.created_at,
+        Task.updated_at,
+    ).where(Task.student_id == current_user["id"])
+
+    task_status = TASK_STATUSES.get(status) if status else None
+    if task_status is not None:
+        query = query.where(Task.status == task_status)
 
     result = await db.execute(query.order_by(desc(Task.created_at)))
-    tasks = result.scalars().all()
-
-    return [
-        TaskResponse(
-            id=str(task.id),
-            student_id=str(task.student_id),
-            title=task.title,
-            description=task.description,
-            category=task.category,
-            deadline=task.deadline.isoformat() if task.deadline else None,
-            status=task.status.value,
-            progress=task.progress,
-            created_at=task.created_at.isoformat(),
-            updated_at=task.updated_at.isoformat(),
-        )
-        for task in tasks
-    ]
+
+    return ORJSONResponse(
+        [
+            {
+                "id": task.id,
+                "student_id": task.student_id,
+                "title": task.title,
+                "description": task.description,
+                "category": task.category,
+                "deadline": task.deadline,
+                "status": task.status,
+                "progress": task.progress,
+                "created_at": task.created_at,
+                "updated_at": task.updated_at,
+            }
+            for task in result
+        ]
+    )
 
 
 @router.post(
@@ -312,16 +378,17 @@ async def create_task(
         title=task_data.title,
         description=task_data.description,
         category=task_data.category,
-        deadline=task_data.deadline,
+        deadline=datetime.combine(task_data.deadline, time.min)
+        if task_data.deadline
+        else None,
         status=TaskStatus.PENDING,
         progress=0,
     )
 
     db.add(task)
     await db.commit()
-    await db.refresh(task)
 
-    return TaskResponse(
+    return TaskResponse.model_construct(
         id=str(task.id),
         student_id=str(task.student_id),
         title=task.title,
@@ -343,14 +410,9 @@ async def update_task(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a task."""
-    result = await db.execute(
-        select(Task).where(
-            (Task.id == task_id) & (Task.student_id == current_user["id"])
-        )
-    )
-    task = result.scalar_one_or_none()
+    task = await db.get(Task, task_id)
 
-    if not task:
+    if not task or str(task.student_id) != current_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
@@ -364,18 +426,17 @@ async def update_task(
     if task_data.progress is not None:
         task.progress = max(0, min(100, task_data.progress))
     if task_data.status is not None:
-        try:
-            task.status = TaskStatus(task_data.status)
-        except ValueError:
+        new_status = TASK_STATUSES.get(task_data.status)
+        if new_status is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status. Must be one of: {[s.value for s in TaskStatus]}",
+                detail=f"Invalid status. Must be one of: {list(TASK_STATUSES)}",
             )
+        task.status = new_status
 
     await db.commit()
-    await db.refresh(task)
 
-    return TaskResponse(
+    return TaskResponse.model_construct(
         id=str(task.id),
         student_id=str(task.student_id),
         title=task.title,
@@ -396,14 +457,9 @@ async def delete_task(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a task."""
-    result = await db.execute(
-        select(Task).where(
-            (Task.id == task_id) & (Task.student_id == current_user["id"])
-        )
-    )
-    task = result.scalar_one_or_none()
+    task = await db.get(Task, task_id)
 
-    if not task:
+    if not task or str(task.student_id) != current_user["id"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
@@ -418,17 +474,26 @@ async def delete_task(
 @router.get("/{opportunity_id}", response_model=OpportunityResponse)
 async def get_opportunity(
     opportunity_id: str,
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a specific opportunity by ID."""
+    """Get a specific opportunity by ID.
+
+    Answers 304 when the client's ETag still matches. The ETag covers the
+    caller's application status, which is part of the response.
+    """
     try:
-        result = await db.execute(
-            select(Opportunity)
-            .options(selectinload(Opportunity.faculty))
-            .where(Opportunity.id == opportunity_id)
+        opportunity = await db.get(
+            Opportunity,
+            opportunity_id,
+            options=[
+                joinedload(Opportunity.faculty).load_only(
+                    User.display_name, User.updated_at
+                )
+            ],
         )
-        opportunity = result.scalar_one_or_none()
 
         if not opportunity:
             raise HTTPException(
@@ -442,37 +507,48 @@ async def get_opportunity(
 
         if current_user["role"] == "STUDENT":
             app_result = await db.execute(
-                select(Application).where(
+                select(Application.status).where(
                     (Application.opportunity_id == opportunity_id)
                     & (Application.student_id == current_user["id"])
                 )
             )
-            application = app_result.scalar_one_or_none()
-            if application:
+            applied_status = app_result.scalar_one_or_none()
+            if applied_status:
                 is_applied = True
-                application_status = application.status.value if hasattr(application.status, "value") else str(application.status)
+                application_status = applied_status.value
 
-        return OpportunityResponse(
+        # faculty_name comes from the joined user, so a rename must change
+        # the ETag even though the opportunity row is untouched
+        faculty_modified = (
+            opportunity.faculty.updated_at.timestamp() if opportunity.faculty else None
+        )
+        headers = {
+            "ETag": weak_etag(
+                opportunity.id,
+                opportunity.updated_at,
+                faculty_modified,
+                application_status,
+            ),
+            "Cache-Control": PRIVATE_REVALIDATE_CACHE_CONTROL,
+        }
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+        response.headers.update(headers)
+
+        return OpportunityResponse.model_construct(
             id=str(opportunity.id),
-            title=str(opportunity.title),
-            description=str(opportunity.description),
-            type=str(opportunity.type.value)
-            if hasattr(opportunity.type, "value")
-            else str(opportunity.type),
+            title=opportunity.title,
+            description=opportunity.description,
+            type=opportunity.type.value,
             faculty_id=str(opportunity.faculty_id),
-            faculty_name=str(opportunity.faculty.display_name)
-            if opportunity.faculty
-            else "Unknown",
-            skills=list(opportunity.skills) if opportunity.skills else [],
-            duration=str(opportunity.duration),
-            stipend=str(opportunity.stipend) if opportunity.stipend else None,
-            deadline=opportunity.deadline.isoformat()
-            if hasattr(opportunity.deadline, "isoformat")
-            else str(opportunity.deadline),
-            is_open=bool(opportunity.is_open),
-            created_at=opportunity.created_at.isoformat()
-            if hasattr(opportunity.created_at, "isoformat")
-            else str(opportunity.created_at),
+            faculty_name=(opportunity.faculty and opportunity.faculty.display_name)
+            or "Unknown",
+            skills=opportunity.skills or [],
+            duration=opportunity.duration,
+            stipend=opportunity.stipend or None,
+            deadline=opportunity.deadline.isoformat(),
+            is_open=opportunity.is_open,
+            created_at=opportunity.created_at.isoformat(),
             is_applied=is_applied,
             application_status=application_status,
         )
@@ -495,10 +571,7 @@ async def delete_opportunity(
     db: AsyncSession = Depends(get_db),
 ):
     """Delete an opportunity (faculty owner or admin only)."""
-    result = await db.execute(
-        select(Opportunity).where(Opportunity.id == opportunity_id)
-    )
-    opportunity = result.scalar_one_or_none()
+    opportunity = await db.get(Opportunity, opportunity_id)
 
     if not opportunity:
         raise HTTPException(
@@ -508,7 +581,7 @@ async def delete_opportunity(
 
     # Only the faculty who created it or admin can delete it
     if (
-        opportunity.faculty_id != current_user["id"]
+        str(opportunity.faculty_id) != current_user["id"]
         and current_user["role"] != UserRole.ADMIN.value
     ):
         raise HTTPException(
@@ -529,10 +602,7 @@ async def close_opportunity(
     db: AsyncSession = Depends(get_db),
 ):
     """Close an opportunity (faculty owner only)."""
-    result = await db.execute(
-        select(Opportunity).where(Opportunity.id == opportunity_id)
-    )
-    opportunity = result.scalar_one_or_none()
+    opportunity = await db.get(Opportunity, opportunity_id)
 
     if not opportunity:
         raise HTTPException(
@@ -542,7 +612,7 @@ async def close_opportunity(
 
     # Only the faculty who created it or admin can close it
     if (
-        opportunity.faculty_id != current_user["id"]
+        str(opportunity.faculty_id) != current_user["id"]
         and current_user["role"] != UserRole.ADMIN.value
     ):
         raise HTTPException(
@@ -572,10 +642,7 @@ async def apply_to_opportunity(
         )
 
     # Check if opportunity exists and is open
-    result = await db.execute(
-        select(Opportunity).where(Opportunity.id == opportunity_id)
-    )
-    opportunity = result.scalar_one_or_none()
+    opportunity = await db.get(Opportunity, opportunity_id)
 
     if not opportunity:
         raise HTTPException(
@@ -589,51 +656,43 @@ async def apply_to_opportunity(
             detail="This opportunity is closed",
         )
 
-    if opportunity.deadline.date() < date.today():
+    if opportunity.deadline < utc_today_start():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Application deadline has passed",
         )
 
-    # Check if already applied
+    # Insert unless the student already applied; the unique constraint makes
+    # this a single race-free round trip
     result = await db.execute(
-        select(Application).where(
-            (Application.opportunity_id == opportunity_id)
-            & (Application.student_id == current_user["id"])
+        insert(Application)
+        .values(
+            opportunity_id=opportunity_id,
+            student_id=current_user["id"],
+            status=ApplicationStatus.SUBMITTED,
+            cover_letter=application_data.cover_letter,
         )
+        .on_conflict_do_nothing(index_elements=["opportunity_id", "student_id"])
+        .returning(Application.id, Application.applied_at)
     )
-    if result.scalar_one_or_none():
+    application = result.first()
+
+    if not application:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Already applied to this opportunity",
         )
 
-    # Create application
-    application = Application(
-        opportunity_id=opportunity_id,
-        student_id=current_user["id"],
-        status=ApplicationStatus.SUBMITTED,
-        cover_letter=application_data.cover_letter,
-    )
-
-    db.add(application)
     await db.commit()
-    await db.refresh(application)
 
-    # Get student and opportunity info
-    student_result = await db.execute(
-        select(User).where(User.id == application.student_id)
-    )
-    student = student_result.scalar_one_or_none()
-
-    return ApplicationResponse(
+    return ApplicationResponse.model_construct(
         id=str(application.id),
-        opportunity_id=str(application.opportunity_id),
+        opportunity_id=str(opportunity.id),
         opportunity_title=opportunity.title,
-        student_id=str(application.student_id),
-        student_name=student.display_name if student else "Unknown",
-        status=application.status.value,
-        cover_letter=application.cover_letter,
+        student_id=current_user["id"],
+        student_name=current_user["display_name"] or "Unknown",
+        status=ApplicationStatus.SUBMITTED.value,
+        cover_letter=application_data.cover_letter,
         applied_at=application.applied_at.isoformat(),
     )
 
@@ -646,10 +705,7 @@ async def list_opportunity_applications(
 ):
     """List applications for an opportunity (faculty owner only)."""
     # Check if opportunity exists
-    result = await db.execute(
-        select(Opportunity).where(Opportunity.id == opportunity_id)
-    )
-    opportunity = result.scalar_one_or_none()
+    opportunity = await db.get(Opportunity, opportunity_id)
 
     if not opportunity:
         raise HTTPException(
@@ -659,7 +715,7 @@ async def list_opportunity_applications(
 
     # Only the faculty who created it or admin can view applications
     if (
-        opportunity.faculty_id != current_user["id"]
+        str(opportunity.faculty_id) != current_user["id"]
         and current_user["role"] != UserRole.ADMIN.value
     ):
         raise HTTPException(
@@ -668,26 +724,35 @@ async def list_opportunity_applications(
         )
 
     result = await db.execute(
-        select(Application)
-        .options(selectinload(Application.student))
+        select(
+            Application.id,
+            Application.opportunity_id,
+            Application.student_id,
+            User.display_name.label("student_name"),
+            Application.status,
+            Application.cover_letter,
+            Application.applied_at,
+        )
+        .outerjoin(User, User.id == Application.student_id)
         .where(Application.opportunity_id == opportunity_id)
         .order_by(desc(Application.applied_at))
     )
-    applications = result.scalars().all()
-
-    return [
-        ApplicationResponse(
-            id=str(app.id),
-            opportunity_id=str(app.opportunity_id),
-            opportunity_title=opportunity.title,
-            student_id=str(app.student_id),
-            student_name=app.student.display_name if app.student else "Unknown",
-            status=app.status.value,
-            cover_letter=app.cover_letter,
-            applied_at=app.applied_at.isoformat(),
-        )
-        for app in applications
-    ]
+
+    return ORJSONResponse(
+        [
+            {
+                "id": row.id,
+                "opportunity_id": row.opportunity_id,
+                "opportunity_title": opportunity.title,
+                "student_id": row.student_id,
+                "student_name": row.student_name or "Unknown",
+                "status": row.status,
+                "cover_letter": row.cover_letter,
+                "applied_at": row.applied_at,
+            }
+            for row in result
+        ]
+    )
 
 
 @router.put("/applications/{application_id}/status", response_model=ApplicationResponse)
@@ -699,14 +764,16 @@ async def update_application_status(
 ):
     """Update application status (faculty owner only)."""
     # Get application with opportunity
-    result = await db.execute(
-        select(Application)
-        .options(
-            selectinload(Application.opportunity), selectinload(Application.student)
-        )
-        .where(Application.id == application_id)
+    application = await db.get(
+        Application,
+        application_id,
+        options=[
+            joinedload(Application.opportunity).load_only(
+                Opportunity.title, Opportunity.faculty_id
+            ),
+            joinedload(Application.student).load_only(User.display_name),
+        ],
     )
-    application = result.scalar_one_or_none()
 
     if not application:
         raise HTTPException(
@@ -716,7 +783,7 @@ async def update_application_status(
 
     # Only the faculty who owns the opportunity or admin can update status
     if (
-        application.opportunity.faculty_id != current_user["id"]
+        str(application.opportunity.faculty_id) != current_user["id"]
         and current_user["role"] != UserRole.ADMIN.value
     ):
         raise HTTPException(
@@ -725,18 +792,17 @@ async def update_application_status(
         )
 
     # Validate status
-    try:
-        new_status = ApplicationStatus(status_update.status)
-    except ValueError:
+    new_status = APPLICATION_STATUSES.get(status_update.status)
+    if new_status is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {[s.value for s in ApplicationStatus]}",
+            detail=f"Invalid status. Must be one of: {list(APPLICATION_STATUSES)}",
         )
 
     application.status = new_status
     await db.commit()
 
-    return ApplicationResponse(
+    return ApplicationResponse.model_construct(
         id=str(application.id),
         opportunity_id=str(application.opportunity_id),
         opportunity_title=application.opportunity.title,
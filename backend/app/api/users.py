@@ -1,14 +1,26 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.deps import get_current_user
-from app.db.database import get_db
-from app.models.user import User
+from app.core.security import averify_password, aget_password_hash
+from app.core.http_cache import (
+    PRIVATE_REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    not_modified,
+    weak_etag,
+)
+from app.db.database import get_db, estimated_row_count
+from app.models.user import User, UserRole
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+USER_ROLES = {r.value: r for r in UserRole}
+
+MAX_PAGE_SIZE = 100
+
 
 class UserProfileResponse(BaseModel):
     id: str
@@ -37,12 +49,16 @@ class PasswordChange(BaseModel):
 
 @router.get("/me", response_model=UserProfileResponse)
 async def get_current_user_profile(
+    request: Request,
+    response: Response,
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get current user's profile."""
-    result = await db.execute(select(User).where(User.id == current_user["id"]))
-    user = result.scalar_one_or_none()
+    """Get current user's profile.
+
+    Answers 304 when the client's ETag still matches the profile.
+    """
+    user = await db.get(User, current_user["id"])
 
     if not user:
         raise HTTPException(
@@ -50,7 +66,15 @@ async def get_current_user_profile(
             detail="User not found",
         )
 
-    return UserProfileResponse(
+    headers = {
+        "ETag": weak_etag(user.id, user.updated_at),
+        "Cache-Control": PRIVATE_REVALIDATE_CACHE_CONTROL,
+    }
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+    response.headers.update(headers)
+
+    return UserProfileResponse.model_construct(
         id=str(user.id),
         email=user.email,
         display_name=user.display_name,
@@ -69,8 +93,7 @@ async def update_current_user_profile(
     db: AsyncSession = Depends(get_db),
 ):
     """Update current user's profile."""
-    result = await db.execute(select(User).where(User.id == current_user["id"]))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, current_user["id"])
 
     if not user:
         raise HTTPException(
@@ -87,9 +110,8 @@ async def update_current_user_profile(
         user.avatar_url = profile_data.avatar_url
 
     await db.commit()
-    await db.refresh(user)
 
-    return UserProfileResponse(
+    return UserProfileResponse.model_construct(
         id=str(user.id),
         email=user.email,
         display_name=user.display_name,
@@ -108,10 +130,7 @@ async def change_password(
     db: AsyncSession = Depends(get_db),
 ):
     """Change user password."""
-    from app.core.security import verify_password, get_password_hash
-
-    result = await db.execute(select(User).where(User.id == current_user["id"]))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, current_user["id"])
 
     if not user:
         raise HTTPException(
@@ -120,51 +139,80 @@ async def change_password(
         )
 
     # Verify current password
-    if not verify_password(password_data.current_password, user.password_hash):
+    if not await averify_password(
+        password_data.current_password, user.password_hash
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
         )
 
     # Hash and update new password
-    user.password_hash = get_password_hash(password_data.new_password)
+    user.password_hash = await aget_password_hash(password_data.new_password)
     await db.commit()
 
     return {"message": "Password changed successfully"}
 
 
-@router.get("/")
+@router.get("/", response_model=List[UserProfileResponse])
 async def list_users(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = MAX_PAGE_SIZE,
+    include_total: bool = False,
     current_user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all users (admin only)."""
-    from app.models.user import UserRole
+    """List all users (admin only).
 
+    With include_total, an estimated user count is returned in the
+    X-Total-Count header.
+    """
     if current_user["role"] != UserRole.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required",
         )
 
-    result = await db.execute(select(User).offset(skip).limit(limit))
-    users = result.scalars().all()
-
-    return [
-        UserProfileResponse(
-            id=str(user.id),
-            email=user.email,
-            display_name=user.display_name,
-            department=user.department,
-            avatar_url=user.avatar_url,
-            role=user.role.value,
-            is_active=user.is_active,
-            created_at=user.created_at.isoformat(),
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # Only the listed columns; never load password hashes for a listing
+    result = await db.execute(
+        select(
+            User.id,
+            User.email,
+            User.display_name,
+            User.department,
+            User.avatar_url,
+            User.role,
+            User.is_active,
+            User.created_at,
         )
-        for user in users
-    ]
+        .offset(skip)
+        .limit(limit)
+    )
+    users = result.all()
+
+    headers = None
+    if include_total:
+        total = await estimated_row_count(db, User.__table__)
+        headers = {"X-Total-Count": str(total)}
+
+    return ORJSONResponse(
+        [
+            {
+                "id": user.id,
+                "email": user.email,
+                "display_name": user.display_name,
+                "department": user.department,
+                "avatar_url": user.avatar_url,
+                "role": user.role,
+                "is_active": user.is_active,
+                "created_at": user.created_at,
+            }
+            for user in users
+        ],
+        headers=headers,
+    )
 
 
 @router.put("/{user_id}/role")
@@ -175,7 +223,6 @@ async def update_user_role(
     db: AsyncSession = Depends(get_db),
 ):
     """Update user role (admin only)."""
-    from app.models.user import UserRole
     from app.api.auth import validate_email_for_role
 
     if current_user["role"] != UserRole.ADMIN.value:
@@ -185,16 +232,14 @@ async def update_user_role(
         )
 
     # Validate role
-    try:
-        new_role = UserRole(role)
-    except ValueError:
+    new_role = USER_ROLES.get(role)
+    if new_role is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid role. Must be one of: {[r.value for r in UserRole]}",
+            detail=f"Invalid role. Must be one of: {list(USER_ROLES)}",
         )
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
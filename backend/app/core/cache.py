@@ -0,0 +1,44 @@
+"""
+Small in-process caches for hot read paths.
+
+Each worker process keeps its own copy, so entries should be short-lived
+and safe to serve slightly stale.
+"""
+
+import time
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded cache whose entries expire a fixed time after being set."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[Any, float]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value, evicting the oldest entry when full.
+
+        ``ttl`` shortens this entry's lifetime below the cache-wide TTL.
+        """
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._data.pop(next(iter(self._data)))
+        if ttl is None or ttl > self.ttl:
+            ttl = self.ttl
+        self._data[key] = (value, time.monotonic() + ttl)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
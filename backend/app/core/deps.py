@@ -1,25 +1,26 @@
 from typing import Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, HTTPException, Request, status
 from app.core.security import verify_token
 from app.core.config import get_settings
 
 settings = get_settings()
-security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> dict:
-    """Get current user from JWT token."""
-    if not credentials:
+async def get_current_user(request: Request) -> dict:
+    """Get current user from JWT token.
+
+    Reads the Authorization header directly rather than through HTTPBearer,
+    which builds a credentials object per request.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
+    # Served from the verified-token cache for repeat requests
     payload = verify_token(token)
 
     if not payload:
@@ -41,17 +42,20 @@ async def get_current_user(
         "id": user_id,
         "email": payload.get("email"),
         "role": payload.get("role"),
+        "display_name": payload.get("display_name"),
     }
 
 
 def require_role(*allowed_roles: str):
     """Dependency factory to check user roles."""
+    roles = frozenset(allowed_roles)
+    required = ", ".join(allowed_roles)
 
     async def role_checker(current_user: dict = Depends(get_current_user)) -> dict:
-        if current_user["role"] not in allowed_roles:
+        if current_user["role"] not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Role '{current_user['role']}' not authorized. Required: {allowed_roles}",
+                detail=f"Role '{current_user['role']}' not authorized. Required: {required}",
             )
         return current_user
 
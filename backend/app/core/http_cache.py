@@ -0,0 +1,32 @@
+"""
+Conditional GET helpers (ETag / If-None-Match).
+"""
+
+from datetime import datetime
+
+from fastapi import Request, Response, status
+
+# Per-user JSON: may be stored by the browser, but must be revalidated
+PRIVATE_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(key, modified_at: datetime, *extra) -> str:
+    """Build a weak ETag from a row key, its last-modified time and extras."""
+    parts = [str(key), f"{modified_at.timestamp():.6f}", *map(str, extra)]
+    return 'W/"' + "-".join(parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weakly compare an ETag against the request's If-None-Match header."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(headers: dict) -> Response:
+    """A bodiless 304 carrying the validator and caching headers."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
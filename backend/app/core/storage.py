@@ -3,9 +3,12 @@ File storage configuration for local storage.
 For S3 migration, see /MIGRATE_TO_S3.md
 """
 
+import asyncio
 import os
+import uuid
 from pathlib import Path
 from typing import Optional
+from PIL import Image, UnidentifiedImageError
 
 # Base storage configuration
 STORAGE_TYPE = os.getenv("STORAGE_TYPE", "local")  # Options: local, s3
@@ -13,17 +16,51 @@ UPLOAD_DIR = Path(
     os.getenv("UPLOAD_DIR", "/home/apsingh/Documents/krkhc_2/backend/uploads")
 )
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB default
-ALLOWED_EXTENSIONS = {
-    ".pdf",
-    ".doc",
-    ".docx",
-    ".jpg",
-    ".jpeg",
-    ".png",
-    ".gif",
-    ".mp4",
-    ".zip",
+UPLOAD_CHUNK_SIZE = 256 * 1024
+AVATAR_THUMBNAIL_SIZE = (256, 256)
+# Images are checked against this from their header, before decoding: a
+# small compressed upload can expand to gigabytes of pixels, and Pillow's
+# own DecompressionBombError only fires past ~179 megapixels
+THUMBNAIL_MAX_PIXELS = 25_000_000
+
+# When serving behind nginx, set this to an `internal` location aliased to
+# UPLOAD_DIR (e.g. "/_internal_uploads/") so nginx sends files itself with
+# sendfile(2) instead of streaming them through Python:
+#
+#     location /_internal_uploads/ {
+#         internal;
+#         alias /path/to/uploads/;
+#     }
+ACCEL_REDIRECT_PREFIX = os.getenv("ACCEL_REDIRECT_PREFIX", "")
+ALLOWED_EXTENSIONS = frozenset(
+    {
+        ".pdf",
+        ".doc",
+        ".docx",
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".gif",
+        ".mp4",
+        ".zip",
+    }
+)
+
+# Leading bytes expected for each extension, as (offset, magic) pairs.
+# Extensions without an entry are not sniffed.
+ZIP_SIGNATURES = ((0, b"PK\x03\x04"), (0, b"PK\x05\x06"))
+FILE_SIGNATURES = {
+    ".pdf": ((0, b"%PDF-"),),
+    ".doc": ((0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"),),
+    ".docx": ZIP_SIGNATURES,
+    ".zip": ZIP_SIGNATURES,
+    ".jpg": ((0, b"\xff\xd8\xff"),),
+    ".jpeg": ((0, b"\xff\xd8\xff"),),
+    ".png": ((0, b"\x89PNG\r\n\x1a\n"),),
+    ".gif": ((0, b"GIF87a"), (0, b"GIF89a")),
+    ".mp4": ((4, b"ftyp"),),
 }
+SIGNATURE_READ_SIZE = 16
 
 # Ensure upload directory exists
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -44,24 +81,110 @@ for dir_path in [
     dir_path.mkdir(exist_ok=True)
 
 
+FILE_TYPE_DIRS = {
+    "grievance_photo": GRIEVANCE_PHOTOS_DIR,
+    "course_resource": COURSE_RESOURCES_DIR,
+    "opportunity_application": OPPORTUNITY_APPLICATIONS_DIR,
+    "user_avatar": USER_AVATARS_DIR,
+}
+
+
 def get_file_path(file_type: str, filename: str) -> Path:
     """Get the appropriate directory for a file type."""
-    directories = {
-        "grievance_photo": GRIEVANCE_PHOTOS_DIR,
-        "course_resource": COURSE_RESOURCES_DIR,
-        "opportunity_application": OPPORTUNITY_APPLICATIONS_DIR,
-        "user_avatar": USER_AVATARS_DIR,
-    }
-
-    base_dir = directories.get(file_type, UPLOAD_DIR)
-    return base_dir / filename
+    return FILE_TYPE_DIRS.get(file_type, UPLOAD_DIR) / filename
 
 
 def is_allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
-    return Path(filename).suffix.lower() in ALLOWED_EXTENSIONS
+    dot = filename.rfind(".")
+    return dot != -1 and filename[dot:].lower() in ALLOWED_EXTENSIONS
+
+
+async def has_valid_signature(file, ext: str) -> bool:
+    """Check that an upload's leading bytes match its extension.
+
+    Only the first few bytes are read, and the file is rewound afterwards so
+    it can still be saved.
+    """
+    signatures = FILE_SIGNATURES.get(ext)
+    if not signatures:
+        return True
+    head = await file.read(SIGNATURE_READ_SIZE)
+    await file.seek(0)
+    return any(
+        head[offset : offset + len(magic)] == magic for offset, magic in signatures
+    )
 
 
 def validate_file_size(file_size: int) -> bool:
     """Check if file size is within limits."""
     return file_size <= MAX_FILE_SIZE
+
+
+async def save_upload(file, dest: Path) -> bool:
+    """Stream an uploaded file to disk in chunks.
+
+    Returns False as soon as the upload exceeds MAX_FILE_SIZE, so oversized
+    bodies are never held in memory. The file is written next to ``dest``
+    and only moved into place once complete, so a rejected upload never
+    clobbers an existing file (e.g. a user's current avatar). Disk writes
+    run in a worker thread to keep the event loop free.
+    """
+    # Unique per upload, so concurrent uploads to the same destination
+    # (e.g. two avatar uploads) never write into each other's temp file
+    partial = dest.with_name(f"{dest.name}.{uuid.uuid4().hex}.part")
+    total = 0
+    complete = False
+    try:
+        f = await asyncio.to_thread(open, partial, "wb")
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if not validate_file_size(total):
+                    break
+                await asyncio.to_thread(f.write, chunk)
+            else:
+                complete = True
+        finally:
+            await asyncio.to_thread(f.close)
+
+        if complete:
+            # Atomic on POSIX: readers see the old file or the new one, never
+            # a partial write
+            await asyncio.to_thread(os.replace, partial, dest)
+        return complete
+    finally:
+        if not complete:
+            await asyncio.to_thread(partial.unlink, missing_ok=True)
+
+
+class ImageTooLargeError(ValueError):
+    """An image's dimensions exceed THUMBNAIL_MAX_PIXELS."""
+
+
+def make_thumbnail(source: Path, size: tuple[int, int]) -> Optional[Path]:
+    """Write a downscaled WebP copy of an image next to it.
+
+    Returns the thumbnail path, or None if the source is not a readable
+    image. Raises ImageTooLargeError for images over THUMBNAIL_MAX_PIXELS.
+    Like save_upload, writes to a temporary file and moves it into place.
+    Blocking; call it from a worker thread.
+    """
+    thumb_path = source.with_name(f"{source.stem}_thumb.webp")
+    partial = thumb_path.with_name(f"{thumb_path.name}.{uuid.uuid4().hex}.part")
+    try:
+        with Image.open(source) as img:
+            if img.width * img.height > THUMBNAIL_MAX_PIXELS:
+                raise ImageTooLargeError(f"{img.width}x{img.height} image")
+            # JPEGs decode straight to a reduced scale; a no-op otherwise
+            img.draft("RGB", size)
+            img.thumbnail(size)
+            img.save(partial, "WEBP", quality=82, method=6)
+        os.replace(partial, thumb_path)
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(str(e)) from e
+    except (UnidentifiedImageError, OSError):
+        return None
+    finally:
+        partial.unlink(missing_ok=True)
+    return thumb_path
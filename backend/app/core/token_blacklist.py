@@ -0,0 +1,37 @@
+"""
+Refresh-token blacklist backed by Redis.
+
+Logged-out and already-rotated refresh tokens are recorded by their ``jti``
+claim until the token would have expired anyway, so the keys clean
+themselves up. Redis failures surface as RedisError; the auth routes fail
+closed on them.
+"""
+
+import math
+import time
+from redis.asyncio import Redis
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Connections are opened lazily on first use. The timeouts turn an
+# unresponsive Redis into a RedisError instead of a hung request.
+redis_client = Redis.from_url(
+    settings.redis_url,
+    socket_connect_timeout=settings.redis_socket_timeout,
+    socket_timeout=settings.redis_socket_timeout,
+)
+
+BLACKLIST_PREFIX = "blacklist:"
+
+
+async def blacklist_token(jti: str, exp: float) -> bool:
+    """Blacklist a token id until its expiry time.
+
+    Returns False if it was already blacklisted. Checking and setting is a
+    single SET NX, so of two concurrent calls for one id only one gets True.
+    """
+    ttl = max(math.ceil(exp - time.time()), 1)
+    return bool(
+        await redis_client.set(f"{BLACKLIST_PREFIX}{jti}", 1, ex=ttl, nx=True)
+    )
@@ -1,4 +1,5 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import Enum, func, select, text
 from sqlalchemy.orm import declarative_base
 from app.core.config import get_settings
 
@@ -9,7 +10,25 @@ engine = create_async_engine(
     settings.async_database_url,
     echo=settings.debug,
     future=True,
-    connect_args={"ssl": False},
+    connect_args={
+        "ssl": False,
+        "command_timeout": settings.db_command_timeout,
+        "statement_cache_size": settings.db_statement_cache_size,
+        # SQLAlchemy's asyncpg adapter prepares statements itself and keeps
+        # them in this per-connection LRU (default 100), separate from
+        # asyncpg's own cache above
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+    },
+    # Keep a warm pool so requests reuse connections instead of paying a
+    # fresh connect per checkout. Behind PgBouncer (transaction pooling)
+    # use poolclass=NullPool and set both statement cache sizes to 0 instead.
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle,
+    # Room for every distinct statement shape the routes emit, so repeat
+    # requests reuse compiled SQL instead of recompiling
+    query_cache_size=1200,
 )
 
 # Create async session factory
@@ -17,12 +36,64 @@ AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
+    # Handlers never query rows they added earlier in the same transaction;
+    # commit() still flushes
+    autoflush=False,
 )
 
 # Base class for models
 Base = declarative_base()
 
 
+def utc_now():
+    """SQL for the current UTC time, for server-side timestamp defaults.
+
+    The timestamp columns are naive and hold UTC, so now() is converted
+    explicitly rather than relying on the server's TimeZone setting.
+    Models that use it for onupdate set eager_defaults, so UPDATE returns
+    the new value instead of expiring it (an async lazy refresh would fail).
+    """
+    return func.timezone("utc", func.now())
+
+
+def string_enum(enum_class):
+    """Store a Python enum as VARCHAR with a CHECK constraint.
+
+    Avoids a Postgres ENUM type: filters compare plain strings, and adding
+    a value is an ALTER TABLE on the constraint rather than ALTER TYPE.
+    """
+    return Enum(enum_class, native_enum=False, create_constraint=True, length=32)
+
+
+def iso_timestamp(column):
+    """Select a timestamp column already formatted as an ISO 8601 string.
+
+    Formatting in Postgres saves a per-row isoformat() call when building
+    responses. NULL stays NULL; microseconds are always included.
+    """
+    return func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS.US').label(column.key)
+
+
+async def estimated_row_count(db: AsyncSession, table) -> int:
+    """Approximate a table's row count from planner statistics.
+
+    Reads pg_class.reltuples instead of scanning the table with count(*).
+    Falls back to an exact count for tables that have never been analyzed.
+    """
+    result = await db.execute(
+        text(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = CAST(:table_name AS regclass)"
+        ),
+        {"table_name": table.name},
+    )
+    estimate = result.scalar()
+    if estimate is None or estimate < 0:
+        result = await db.execute(select(func.count()).select_from(table))
+        return result.scalar_one()
+    return estimate
+
+
 async def get_db():
     """Dependency to get database session."""
     async with AsyncSessionLocal() as session:
@@ -0,0 +1,69 @@
+"""
+Schema setup and Alembic migrations.
+
+Tables come from Base.metadata.create_all, which never alters a table that
+already exists. Changes to existing tables (defaults, constraints, indexes)
+ship as Alembic revisions under backend/alembic/versions, applied here on
+startup and by `alembic upgrade head`.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from app.db.database import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Serializes schema setup across workers starting at the same time
+SCHEMA_LOCK_KEY = 0x4AE615
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Alembic config that runs over the given connection, if any."""
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["connection"] = connection
+    return config
+
+
+def head_revision() -> Optional[str]:
+    """The newest revision in backend/alembic/versions."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """The revision the database is stamped with, or None if unversioned."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def create_schema(connection: Connection) -> None:
+    """Create every table and stamp the database with the head revision.
+
+    Only for an empty database: create_all already builds the current
+    schema, so there is nothing to migrate.
+    """
+    Base.metadata.create_all(connection)
+    command.stamp(alembic_config(connection), "head")
+
+
+def sync_schema(connection: Connection) -> None:
+    """Bring the database up to the models (run with conn.run_sync).
+
+    An empty database gets the current schema directly. Otherwise missing
+    tables are created and pending migrations applied to the existing ones.
+    """
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+    )
+    if not inspect(connection).has_table("users"):
+        create_schema(connection)
+        return
+    Base.metadata.create_all(connection)
+    command.upgrade(alembic_config(connection), "head")
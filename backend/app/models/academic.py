@@ -1,5 +1,3 @@
-import uuid
-from datetime import datetime
 from sqlalchemy import (
     Column,
     String,
@@ -8,11 +6,13 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     ARRAY,
-    Enum as SQLEnum,
+    Index,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.database import Base, string_enum, utc_now
 import enum
 
 
@@ -25,7 +25,9 @@ class ResourceType(str, enum.Enum):
 class Course(Base):
     __tablename__ = "courses"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     code = Column(String(50), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     credits = Column(Integer, nullable=False)
@@ -33,33 +35,48 @@ class Course(Base):
     professor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     department = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, server_default=utc_now(), onupdate=utc_now(), nullable=False
     )
+    __mapper_args__ = {"eager_defaults": True}
 
-    professor = relationship("User", back_populates="taught_courses")
+    professor = relationship("User", back_populates="taught_courses", lazy="raise")
     enrollments = relationship("Enrollment", back_populates="course")
     resources = relationship("Resource", back_populates="course")
     events = relationship("CalendarEvent", back_populates="course")
 
+    __table_args__ = (
+        # list_courses filters
+        Index("ix_course_semester", "semester"),
+        Index("ix_course_department", "department"),
+    )
+
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     student_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
     semester = Column(String(50), nullable=False)
     attendance_count = Column(Integer, default=0, nullable=False)
     total_classes = Column(Integer, default=0, nullable=False)
-    enrolled_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    enrolled_at = Column(DateTime, server_default=utc_now(), nullable=False)
 
     student = relationship("User", back_populates="enrollments")
     course = relationship("Course", back_populates="enrollments")
 
     __table_args__ = (
-        # Unique constraint for student-course-semester combination
+        # One enrollment per student per course; also serves the
+        # "already enrolled" / "is_enrolled" lookups
+        UniqueConstraint(
+            "student_id", "course_id", name="uq_enrollment_student_course"
+        ),
+        # Enrollment counts per course
+        Index("ix_enrollment_course", "course_id"),
         {"sqlite_autoincrement": True},
     )
 
@@ -67,26 +84,35 @@ class Enrollment(Base):
 class Resource(Base):
     __tablename__ = "resources"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
     uploader_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    type = Column(SQLEnum(ResourceType), nullable=False)
+    type = Column(string_enum(ResourceType), nullable=False)
     title = Column(String(255), nullable=False)
     year = Column(Integer, nullable=False)
     exam_type = Column(String(100), nullable=True)
     file_path = Column(String(500), nullable=False)
-    tags = Column(ARRAY(String), default=[])
+    tags = Column(ARRAY(String), server_default=text("'{}'"))
     downloads = Column(Integer, default=0, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
 
-    course = relationship("Course", back_populates="resources")
-    uploader = relationship("User", back_populates="resources")
+    course = relationship("Course", back_populates="resources", lazy="raise")
+    uploader = relationship("User", back_populates="resources", lazy="raise")
+
+    __table_args__ = (
+        # list_course_resources: WHERE course_id = ? ORDER BY created_at DESC
+        Index("ix_resource_course_created", "course_id", "created_at"),
+    )
 
 
 class CalendarEvent(Base):
     __tablename__ = "calendar_events"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -94,6 +120,11 @@ class CalendarEvent(Base):
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
     created_by = Column(String(255), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
 
     course = relationship("Course", back_populates="events")
+
+    __table_args__ = (
+        # list_course_calendar: WHERE course_id = ? ORDER BY start_date
+        Index("ix_calendar_event_course_start", "course_id", "start_date"),
+    )
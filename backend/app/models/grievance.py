@@ -1,19 +1,18 @@
-import uuid
-from datetime import datetime
 from sqlalchemy import (
     Column,
     String,
     DateTime,
     Boolean,
-    Enum as SQLEnum,
+    text,
     Integer,
     ForeignKey,
     Text,
     ARRAY,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.database import Base, string_enum, utc_now
 import enum
 
 
@@ -42,41 +41,62 @@ class GrievanceStatus(str, enum.Enum):
 class Grievance(Base):
     __tablename__ = "grievances"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     submitter_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    category = Column(SQLEnum(GrievanceCategory), nullable=False)
-    priority = Column(SQLEnum(Priority), nullable=False)
+    category = Column(string_enum(GrievanceCategory), nullable=False)
+    priority = Column(string_enum(Priority), nullable=False)
     location = Column(String(255), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     status = Column(
-        SQLEnum(GrievanceStatus), default=GrievanceStatus.SUBMITTED, nullable=False
+        string_enum(GrievanceStatus), default=GrievanceStatus.SUBMITTED, nullable=False
     )
     is_anonymous = Column(Boolean, default=False, nullable=False)
-    photos = Column(ARRAY(String), default=[])
+    photos = Column(ARRAY(String), server_default=text("'{}'"))
     assigned_to = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, server_default=utc_now(), onupdate=utc_now(), nullable=False
     )
+    __mapper_args__ = {"eager_defaults": True}
 
-    submitter = relationship("User", back_populates="grievances")
+    # Names are fetched in bulk by the API (see get_user_names); never lazy-load
+    submitter = relationship("User", back_populates="grievances", lazy="raise")
     updates = relationship(
-        "GrievanceUpdate", back_populates="grievance", cascade="all, delete-orphan"
+        "GrievanceUpdate",
+        back_populates="grievance",
+        cascade="all, delete-orphan",
+        lazy="raise",
+    )
+
+    __table_args__ = (
+        # list_grievances: optional filter, ORDER BY created_at DESC
+        Index("ix_grievance_submitter_created", "submitter_id", "created_at"),
+        Index("ix_grievance_status_created", "status", "created_at"),
+        Index("ix_grievance_category_created", "category", "created_at"),
     )
 
 
 class GrievanceUpdate(Base):
     __tablename__ = "grievance_updates"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     grievance_id = Column(
         UUID(as_uuid=True), ForeignKey("grievances.id"), nullable=False
     )
     updated_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    status = Column(SQLEnum(GrievanceStatus), nullable=False)
+    status = Column(string_enum(GrievanceStatus), nullable=False)
     remark = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
 
     grievance = relationship("Grievance", back_populates="updates")
-    updater = relationship("User", back_populates="grievance_updates")
+    updater = relationship("User", back_populates="grievance_updates", lazy="raise")
+
+    __table_args__ = (
+        # selectinload(Grievance.updates): WHERE grievance_id IN (...)
+        Index("ix_grievance_update_grievance", "grievance_id"),
+    )
@@ -1,19 +1,18 @@
-import uuid
-from datetime import datetime
 from sqlalchemy import (
     Column,
     String,
     DateTime,
     ForeignKey,
     Text,
-    ARRAY,
     Integer,
     Boolean,
-    Enum as SQLEnum,
+    text,
+    Index,
+    UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.database import Base, string_enum, utc_now
 import enum
 
 
@@ -33,47 +32,77 @@ class OpportunityType(str, enum.Enum):
 class Opportunity(Base):
     __tablename__ = "opportunities"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     faculty_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     type = Column(
-        SQLEnum(OpportunityType), default=OpportunityType.RESEARCH, nullable=False
+        string_enum(OpportunityType), default=OpportunityType.RESEARCH, nullable=False
     )
-    skills = Column(ARRAY(String), default=[])
+    skills = Column(ARRAY(String), server_default=text("'{}'"))
     duration = Column(String(100), nullable=False)
     stipend = Column(String(100), nullable=True)
     deadline = Column(DateTime, nullable=False)
     is_open = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, server_default=utc_now(), onupdate=utc_now(), nullable=False
     )
+    __mapper_args__ = {"eager_defaults": True}
 
-    faculty = relationship("User", back_populates="opportunities")
+    faculty = relationship("User", back_populates="opportunities", lazy="raise")
     applications = relationship("Application", back_populates="opportunity")
 
+    __table_args__ = (
+        # list_opportunities: WHERE is_open = ? AND deadline >= ?
+        # ORDER BY created_at DESC. Leading with created_at after the equality
+        # column lets the sort come from the index; deadline is checked per row.
+        Index("ix_opportunity_open_created", "is_open", "created_at"),
+        # list_opportunities skills filter: skills && ARRAY[...]
+        Index("ix_opportunity_skills", "skills", postgresql_using="gin"),
+    )
+
 
 class Application(Base):
     __tablename__ = "applications"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     opportunity_id = Column(
         UUID(as_uuid=True), ForeignKey("opportunities.id"), nullable=False
     )
     student_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     status = Column(
-        SQLEnum(ApplicationStatus), default=ApplicationStatus.SUBMITTED, nullable=False
+        string_enum(ApplicationStatus),
+        default=ApplicationStatus.SUBMITTED,
+        nullable=False,
     )
     resume_path = Column(String(500), nullable=True)
     cover_letter = Column(Text, nullable=True)
-    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    applied_at = Column(DateTime, server_default=utc_now(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, server_default=utc_now(), onupdate=utc_now(), nullable=False
     )
+    __mapper_args__ = {"eager_defaults": True}
 
-    opportunity = relationship("Opportunity", back_populates="applications")
-    student = relationship("User", back_populates="applications")
+    opportunity = relationship(
+        "Opportunity", back_populates="applications", lazy="raise"
+    )
+    student = relationship("User", back_populates="applications", lazy="raise")
+
+    __table_args__ = (
+        # One application per student per opportunity; apply_to_opportunity
+        # relies on it for ON CONFLICT DO NOTHING
+        UniqueConstraint(
+            "opportunity_id", "student_id", name="uq_application_opportunity_student"
+        ),
+        # list_opportunity_applications / list_my_applications, newest first
+        Index("ix_application_opportunity_applied", "opportunity_id", "applied_at"),
+        Index("ix_application_student_applied", "student_id", "applied_at"),
+    )
 
 
 class TaskStatus(str, enum.Enum):
@@ -85,17 +114,25 @@ class TaskStatus(str, enum.Enum):
 class Task(Base):
     __tablename__ = "tasks"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     student_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     category = Column(String(100), nullable=False)
     deadline = Column(DateTime, nullable=True)
-    status = Column(SQLEnum(TaskStatus), default=TaskStatus.PENDING, nullable=False)
+    status = Column(string_enum(TaskStatus), default=TaskStatus.PENDING, nullable=False)
     progress = Column(Integer, default=0, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, server_default=utc_now(), onupdate=utc_now(), nullable=False
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     student = relationship("User", back_populates="tasks")
+
+    __table_args__ = (
+        # list_my_tasks: WHERE student_id = ? ORDER BY created_at DESC
+        Index("ix_task_student_created", "student_id", "created_at"),
+    )
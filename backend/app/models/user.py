@@ -1,9 +1,7 @@
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Boolean, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from app.db.database import Base
+from app.db.database import Base, string_enum, utc_now
 import enum
 
 
@@ -17,18 +15,21 @@ class UserRole(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(
+        UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()")
+    )
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
-    role = Column(SQLEnum(UserRole), default=UserRole.STUDENT, nullable=False)
+    role = Column(string_enum(UserRole), default=UserRole.STUDENT, nullable=False)
     display_name = Column(String(255), nullable=True)
     department = Column(String(255), nullable=True)
     avatar_url = Column(String(500), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, server_default=utc_now(), onupdate=utc_now(), nullable=False
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     # Pillar II: Voice - Grievances
     grievances = relationship("Grievance", back_populates="submitter")
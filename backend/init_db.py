@@ -1,25 +1,13 @@
 import asyncio
-from app.db.database import engine, Base
-from app.models import (
-    User,
-    Grievance,
-    GrievanceUpdate,
-    Course,
-    Enrollment,
-    Resource,
-    CalendarEvent,
-    Opportunity,
-    Application,
-    Task,
-)
+from app.db.database import engine
+from app.db.migrations import sync_schema
 
 
 async def init_db():
-    """Initialize database tables."""
+    """Initialize database tables and apply pending migrations."""
     async with engine.begin() as conn:
-        # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
-    print("Database tables created successfully!")
+        await conn.run_sync(sync_schema)
+    print("Database schema is up to date!")
 
 
 if __name__ == "__main__":
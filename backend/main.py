@@ -2,22 +2,24 @@ import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from app.core.config import get_settings
 from app.core.storage import UPLOAD_DIR
 from app.api import auth, users, grievances, courses, opportunities, files
-from app.db.database import engine, Base
+from app.db.database import engine
+from app.db.migrations import sync_schema
 
 settings = get_settings()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create database tables on startup."""
-    # Create tables
+    """Create or migrate database tables on startup."""
+    # Create missing tables, then apply pending migrations
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("✅ Database tables created")
+        await conn.run_sync(sync_schema)
+    print("✅ Database schema up to date")
     yield
     # Cleanup (if needed)
 
@@ -28,6 +30,7 @@ app = FastAPI(
     version="0.1.0",
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration - support both local dev and production
@@ -54,6 +57,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # Mount uploads directory for local file serving
@@ -3,27 +3,37 @@
 Database Seeding Script for AEGIS Platform
 
 This script:
-1. Resets the database (drops and recreates all tables)
+1. Resets the database (empties all tables; drops and recreates them when
+   the schema is not at the latest migration or SEED_FORCE_RESET=1)
 2. Creates 4 test user accounts (Faculty, Authority, Student, Admin)
 3. Creates sample data for all 4 pillars
 
 Usage:
     cd /home/apsingh/Documents/krkhc_2/backend
     source .venv/bin/activate
-    python seed.py
+    python seed.py [-v]
 """
 
 import asyncio
+import logging
+import os
 import sys
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime, time, timedelta
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy import select
-from app.db.database import engine, Base, get_db
-from app.core.security import get_password_hash
+# Seed accounts share a well-known test password, so full-cost hashes buy
+# nothing; bcrypt's minimum cost keeps seeding fast. Must be set before
+# app settings are imported. Export BCRYPT_ROUNDS to override.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from sqlalchemy import insert, select, text
+from app.db.database import engine, Base, AsyncSessionLocal
+from app.db.migrations import create_schema, current_revision, head_revision
+from app.core.security import aget_password_hash
 from app.models.user import User, UserRole
 from app.models.grievance import (
     Grievance,
@@ -48,6 +58,19 @@ from app.models.opportunity import (
     TaskStatus,
 )
 
+# uvloop ships with uvicorn[standard]; fall back to the default loop where
+# it isn't installed (e.g. Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop_factory = None
+else:
+    uvloop_factory = uvloop.new_event_loop
+
+# Per-row progress goes to DEBUG; pass -v to see it. By default only one
+# summary line per step is printed.
+logger = logging.getLogger("seed")
+
 # Test account credentials
 TEST_PASSWORD = "password123"
 TEST_USERS = [
@@ -106,501 +129,569 @@ TEST_USERS = [
     },
 ]
 
+# Calendar schedule, as offsets from midnight on the seeding day. Each
+# course has 2 lectures a week (10:00-11:30, two days apart) for the next
+# 4 weeks, then an assignment due in 2 weeks and a quiz in 3.
+LECTURE_OFFSETS = [
+    (
+        timedelta(weeks=week, days=day, hours=10),
+        timedelta(weeks=week, days=day, hours=11, minutes=30),
+    )
+    for week in range(4)
+    for day in (0, 2)
+]
+ASSIGNMENT_DUE_OFFSET = timedelta(days=14, hours=23, minutes=59)
+QUIZ_OFFSETS = (timedelta(days=21, hours=14), timedelta(days=21, hours=15))
+
+TRUNCATE_ALL_TABLES = "TRUNCATE {} RESTART IDENTITY CASCADE".format(
+    ", ".join(table.name for table in Base.metadata.sorted_tables)
+)
+
+# Sample opportunities; deadlines are days after the seed's reference time
+OPPORTUNITY_TEMPLATES = (
+    {
+        "title": "Research Assistant - Machine Learning",
+        "description": "Looking for a motivated student to help with research on neural networks and deep learning applications in computer vision.",
+        "type": OpportunityType.RESEARCH,
+        "skills": ["Python", "Machine Learning", "TensorFlow", "PyTorch"],
+        "duration": "6 months",
+        "stipend": "8000/month",
+        "deadline_days": 30,
+        "is_open": True,
+        "creator_idx": 0,  # faculty1
+        "creator_type": "faculty",
+    },
+    {
+        "title": "Summer Internship - Web Development",
+        "description": "Full-stack web development internship. Work on real projects using React, Node.js, and PostgreSQL.",
+        "type": OpportunityType.INTERNSHIP,
+        "skills": ["JavaScript", "React", "Node.js", "PostgreSQL"],
+        "duration": "3 months",
+        "stipend": "15000/month",
+        "deadline_days": 45,
+        "is_open": True,
+        "creator_idx": 0,  # faculty1
+        "creator_type": "faculty",
+    },
+    {
+        "title": "Research Project - Data Science",
+        "description": "Authority-sponsored research project on campus data analytics and student performance prediction.",
+        "type": OpportunityType.RESEARCH,
+        "skills": ["Python", "Data Science", "Statistics", "Pandas"],
+        "duration": "1 year",
+        "stipend": "10000/month",
+        "deadline_days": 60,
+        "is_open": True,
+        "creator_idx": 0,  # authority1
+        "creator_type": "authority",
+    },
+    {
+        "title": "Research Assistant - IoT Systems",
+        "description": "Work on Internet of Things research projects involving sensors, embedded systems, and data collection.",
+        "type": OpportunityType.RESEARCH,
+        "skills": ["C++", "Arduino", "Raspberry Pi", "Embedded Systems"],
+        "duration": "6 months",
+        "stipend": "9000/month",
+        "deadline_days": 35,
+        "is_open": True,
+        "creator_idx": 1,  # faculty2
+        "creator_type": "faculty",
+    },
+    {
+        "title": "Campus Sustainability Project",
+        "description": "Lead research on campus sustainability initiatives and green energy solutions.",
+        "type": OpportunityType.RESEARCH,
+        "skills": ["Research", "Data Analysis", "Sustainability", "Reporting"],
+        "duration": "8 months",
+        "stipend": "7500/month",
+        "deadline_days": 50,
+        "is_open": True,
+        "creator_idx": 1,  # authority2
+        "creator_type": "authority",
+    },
+)
+
 
 async def reset_database():
-    """Drop all tables and recreate them."""
+    """Empty all tables, or drop and recreate them if the schema is stale.
+
+    TRUNCATE clears every table in one statement without touching the
+    catalog, but only when the database is stamped with the latest Alembic
+    revision; otherwise the tables are dropped and rebuilt from the models.
+    SEED_FORCE_RESET=1 always drops and recreates them.
+    """
     print("--- Resetting database...")
-    print("DEBUG: Calling engine.begin()")
+    logger.debug("Calling engine.begin()")
     try:
         async with engine.begin() as conn:
-            print("DEBUG: Entered engine.begin() context")
-            await conn.run_sync(Base.metadata.drop_all)
-            print("DEBUG: Dropped tables")
-            await conn.run_sync(Base.metadata.create_all)
-            print("DEBUG: Created tables")
+            logger.debug("Entered engine.begin() context")
+            revision = await conn.run_sync(current_revision)
+            logger.debug("Schema revision %s, head %s", revision, head_revision())
+            if os.getenv("SEED_FORCE_RESET") or revision != head_revision():
+                await conn.run_sync(Base.metadata.drop_all)
+                logger.debug("Dropped tables")
+                await conn.run_sync(create_schema)
+                logger.debug("Created tables and stamped head revision")
+            else:
+                # Only creates tables that don't exist yet
+                await conn.run_sync(Base.metadata.create_all)
+                logger.debug("Created tables")
+                await conn.execute(text(TRUNCATE_ALL_TABLES))
+                logger.debug("Truncated tables")
     except Exception as e:
-        print(f"DEBUG: Exception in reset_database: {e}")
+        logger.debug("Exception in reset_database: %s", e)
         raise
     print("Done. Database reset complete")
 
 
-async def create_test_users():
+async def create_test_users(db):
     """Create test user accounts."""
     print("\n--- Creating test users...")
 
-    async for db in get_db():
-        users = []
-        for user_data in TEST_USERS:
-            # Check if user already exists
-            result = await db.execute(
-                select(User).where(User.email == user_data["email"])
-            )
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                print(f"  Warning: User {user_data['email']} already exists")
-                users.append(existing)
-                continue
-
-            # Create user
-            user = User(
-                email=user_data["email"],
-                password_hash=get_password_hash(user_data["password"]),
-                display_name=user_data["display_name"],
-                department=user_data["department"],
-                role=user_data["role"],
-                is_active=True,
-            )
-            db.add(user)
-            await db.flush()  # Flush to get the ID
-            users.append(user)
-            print(f"  Created {user_data['role'].value}: {user_data['email']}")
-
-        await db.commit()
-        return users
-
-
-async def create_sample_courses(users):
+    # One lookup for every test email instead of one per user
+    result = await db.execute(
+        select(User).where(User.email.in_([u["email"] for u in TEST_USERS]))
+    )
+    existing = {user.email: user for user in result.scalars()}
+
+    # Test accounts share passwords, so hash each distinct password once;
+    # bcrypt releases the GIL, so the hashes run in parallel on the
+    # bcrypt thread pool
+    passwords = list({u["password"] for u in TEST_USERS if u["email"] not in existing})
+    hashes = dict(
+        zip(
+            passwords,
+            await asyncio.gather(*(aget_password_hash(p) for p in passwords)),
+        )
+    )
+
+    users = []
+    for user_data in TEST_USERS:
+        if user_data["email"] in existing:
+            print(f"  Warning: User {user_data['email']} already exists")
+            users.append(existing[user_data["email"]])
+            continue
+
+        # Create user
+        user = User(
+            email=user_data["email"],
+            password_hash=hashes[user_data["password"]],
+            display_name=user_data["display_name"],
+            department=user_data["department"],
+            role=user_data["role"],
+            is_active=True,
+        )
+        db.add(user)
+        users.append(user)
+        logger.debug("  Created %s: %s", user_data["role"].value, user_data["email"])
+
+    # A single flush inserts all new users in one batched INSERT ...
+    # RETURNING, which fills in their IDs
+    await db.flush()
+    print(f"  Created {len(users) - len(existing)} users")
+    return users
+
+
+async def create_sample_courses(db, by_role):
     """Create sample courses for multiple faculty."""
     print("\n--- Creating sample courses...")
 
-    async for db in get_db():
-        # Get all faculty users
-        faculties = [u for u in users if u.role == UserRole.FACULTY]
-        if not faculties:
-            print("  Warning: No faculty users found, skipping courses")
-            return []
-
-        courses_data = [
-            {
-                "code": "CS101",
-                "name": "Introduction to Computer Science",
-                "credits": 4,
-                "semester": "Spring 2026",
-                "department": "Computer Science",
-                "description": "Fundamental concepts of computer science and programming. Topics include algorithms, data structures, and software engineering principles.",
-                "professor_idx": 0,
-            },
-            {
-                "code": "CS201",
-                "name": "Data Structures and Algorithms",
-                "credits": 4,
-                "semester": "Spring 2026",
-                "department": "Computer Science",
-                "description": "Advanced data structures and algorithm design techniques. Arrays, linked lists, trees, graphs, sorting, and searching algorithms.",
-                "professor_idx": 0,
-            },
-            {
-                "code": "CS301",
-                "name": "Machine Learning",
-                "credits": 3,
-                "semester": "Spring 2026",
-                "department": "Computer Science",
-                "description": "Introduction to machine learning algorithms, neural networks, deep learning, and practical applications.",
-                "professor_idx": 0,
-            },
-            {
-                "code": "EE101",
-                "name": "Basic Electrical Engineering",
-                "credits": 4,
-                "semester": "Spring 2026",
-                "department": "Electrical Engineering",
-                "description": "Fundamentals of electrical engineering including circuits, signals, and systems.",
-                "professor_idx": 1,
-            },
-            {
-                "code": "EE201",
-                "name": "Digital Signal Processing",
-                "credits": 3,
-                "semester": "Spring 2026",
-                "department": "Electrical Engineering",
-                "description": "Analysis and processing of digital signals, Fourier transforms, and filter design.",
-                "professor_idx": 1,
-            },
-        ]
-
-        courses = []
-        for course_data in courses_data:
-            professor_idx = course_data.pop("professor_idx")
-            professor = faculties[professor_idx % len(faculties)]
-            course = Course(professor_id=professor.id, **course_data)
-            db.add(course)
-            await db.flush()
-            courses.append(course)
-            print(
-                f"  Created course: {course_data['code']} - {course_data['name']} (by {professor.display_name})"
-            )
-
-        await db.commit()
-        return courses
-
-
-async def create_sample_grievances(users):
+    # Get all faculty users
+    faculties = by_role[UserRole.FACULTY]
+    if not faculties:
+        print("  Warning: No faculty users found, skipping courses")
+        return []
+
+    courses_data = [
+        {
+            "code": "CS101",
+            "name": "Introduction to Computer Science",
+            "credits": 4,
+            "semester": "Spring 2026",
+            "department": "Computer Science",
+            "description": "Fundamental concepts of computer science and programming. Topics include algorithms, data structures, and software engineering principles.",
+            "professor_idx": 0,
+        },
+        {
+            "code": "CS201",
+            "name": "Data Structures and Algorithms",
+            "credits": 4,
+            "semester": "Spring 2026",
+            "department": "Computer Science",
+            "description": "Advanced data structures and algorithm design techniques. Arrays, linked lists, trees, graphs, sorting, and searching algorithms.",
+            "professor_idx": 0,
+        },
+        {
+            "code": "CS301",
+            "name": "Machine Learning",
+            "credits": 3,
+            "semester": "Spring 2026",
+            "department": "Computer Science",
+            "description": "Introduction to machine learning algorithms, neural networks, deep learning, and practical applications.",
+            "professor_idx": 0,
+        },
+        {
+            "code": "EE101",
+            "name": "Basic Electrical Engineering",
+            "credits": 4,
+            "semester": "Spring 2026",
+            "department": "Electrical Engineering",
+            "description": "Fundamentals of electrical engineering including circuits, signals, and systems.",
+            "professor_idx": 1,
+        },
+        {
+            "code": "EE201",
+            "name": "Digital Signal Processing",
+            "credits": 3,
+            "semester": "Spring 2026",
+            "department": "Electrical Engineering",
+            "description": "Analysis and processing of digital signals, Fourier transforms, and filter design.",
+            "professor_idx": 1,
+        },
+    ]
+
+    courses = []
+    for course_data in courses_data:
+        professor_idx = course_data.pop("professor_idx")
+        professor = faculties[professor_idx % len(faculties)]
+        course = Course(professor_id=professor.id, **course_data)
+        db.add(course)
+        await db.flush()
+        courses.append(course)
+        logger.debug(
+            "  Created course: %s - %s (by %s)",
+            course_data["code"],
+            course_data["name"],
+            professor.display_name,
+        )
+    print(f"  Created {len(courses)} courses")
+    return courses
+
+
+async def create_sample_grievances(db, by_role):
     """Create sample grievances from multiple students."""
     print("\n--- Creating sample grievances...")
 
-    async for db in get_db():
-        students = [u for u in users if u.role == UserRole.STUDENT]
-        if not students:
-            print("  Warning: No student users found, skipping grievances")
-            return []
-
-        grievances_data = [
-            {
-                "title": "WiFi not working in Hostel Block A",
-                "description": "The WiFi has been down for 3 days in Hostel Block A, rooms 101-150. Unable to attend online classes.",
-                "category": GrievanceCategory.INFRASTRUCTURE,
-                "priority": Priority.HIGH,
-                "location": "Hostel Block A",
-                "is_anonymous": False,
-                "status": GrievanceStatus.SUBMITTED,
-                "student_idx": 0,
-            },
-            {
-                "title": "Library AC needs repair",
-                "description": "The air conditioning in the main library reading room is not working properly. It's very hot during afternoon hours.",
-                "category": GrievanceCategory.INFRASTRUCTURE,
-                "priority": Priority.MEDIUM,
-                "location": "Main Library",
-                "is_anonymous": True,
-                "status": GrievanceStatus.UNDER_REVIEW,
-                "student_idx": 0,
-            },
+    students = by_role[UserRole.STUDENT]
+    if not students:
+        print("  Warning: No student users found, skipping grievances")
+        return []
+
+    grievances_data = [
+        {
+            "title": "WiFi not working in Hostel Block A",
+            "description": "The WiFi has been down for 3 days in Hostel Block A, rooms 101-150. Unable to attend online classes.",
+            "category": GrievanceCategory.INFRASTRUCTURE,
+            "priority": Priority.HIGH,
+            "location": "Hostel Block A",
+            "is_anonymous": False,
+            "status": GrievanceStatus.SUBMITTED,
+            "student_idx": 0,
+        },
+        {
+            "title": "Library AC needs repair",
+            "description": "The air conditioning in the main library reading room is not working properly. It's very hot during afternoon hours.",
+            "category": GrievanceCategory.INFRASTRUCTURE,
+            "priority": Priority.MEDIUM,
+            "location": "Main Library",
+            "is_anonymous": True,
+            "status": GrievanceStatus.UNDER_REVIEW,
+            "student_idx": 0,
+        },
+        {
+            "title": "Canteen food quality issue",
+            "description": "The quality of food in the main canteen has degraded significantly. Several students reported stomach issues.",
+            "category": GrievanceCategory.FOOD,
+            "priority": Priority.URGENT,
+            "location": "Main Canteen",
+            "is_anonymous": False,
+            "status": GrievanceStatus.IN_PROGRESS,
+            "student_idx": 1,
+        },
+        {
+            "title": "Broken furniture in classroom B-204",
+            "description": "Several chairs and desks in classroom B-204 are broken and need immediate replacement.",
+            "category": GrievanceCategory.INFRASTRUCTURE,
+            "priority": Priority.MEDIUM,
+            "location": "Classroom B-204",
+            "is_anonymous": False,
+            "status": GrievanceStatus.SUBMITTED,
+            "student_idx": 1,
+        },
+        {
+            "title": "Hostel laundry machines not working",
+            "description": "All three washing machines in Hostel Block C laundry room are out of order for the past week.",
+            "category": GrievanceCategory.HOSTEL,
+            "priority": Priority.HIGH,
+            "location": "Hostel Block C Laundry",
+            "is_anonymous": True,
+            "status": GrievanceStatus.SUBMITTED,
+            "student_idx": 0,
+        },
+    ]
+
+    submitters = []
+    for grievance_data in grievances_data:
+        student_idx = grievance_data.pop("student_idx")
+        student = students[student_idx % len(students)]
+        submitters.append(student)
+        grievance_data["submitter_id"] = (
+            student.id if not grievance_data["is_anonymous"] else None
+        )
+
+    # Two statements in total: every grievance in one batched INSERT ...
+    # RETURNING (ids come back in parameter order), then all initial updates
+    result = await db.execute(
+        insert(Grievance).returning(Grievance.id, sort_by_parameter_order=True),
+        grievances_data,
+    )
+    await db.execute(
+        insert(GrievanceUpdate),
+        [
             {
-                "title": "Canteen food quality issue",
-                "description": "The quality of food in the main canteen has degraded significantly. Several students reported stomach issues.",
-                "category": GrievanceCategory.FOOD,
-                "priority": Priority.URGENT,
-                "location": "Main Canteen",
-                "is_anonymous": False,
-                "status": GrievanceStatus.IN_PROGRESS,
-                "student_idx": 1,
-            },
-            {
-                "title": "Broken furniture in classroom B-204",
-                "description": "Several chairs and desks in classroom B-204 are broken and need immediate replacement.",
-                "category": GrievanceCategory.INFRASTRUCTURE,
-                "priority": Priority.MEDIUM,
-                "location": "Classroom B-204",
-                "is_anonymous": False,
-                "status": GrievanceStatus.SUBMITTED,
-                "student_idx": 1,
-            },
-            {
-                "title": "Hostel laundry machines not working",
-                "description": "All three washing machines in Hostel Block C laundry room are out of order for the past week.",
-                "category": GrievanceCategory.HOSTEL,
-                "priority": Priority.HIGH,
-                "location": "Hostel Block C Laundry",
-                "is_anonymous": True,
-                "status": GrievanceStatus.SUBMITTED,
-                "student_idx": 0,
-            },
-        ]
-
-        for grievance_data in grievances_data:
-            student_idx = grievance_data.pop("student_idx")
-            student = students[student_idx % len(students)]
-
-            grievance = Grievance(
-                submitter_id=student.id if not grievance_data["is_anonymous"] else None,
-                **{k: v for k, v in grievance_data.items() if k != "status"},
-            )
-            grievance.status = grievance_data["status"]
-            db.add(grievance)
-            await db.flush()
-
-            # Add initial update
-            update = GrievanceUpdate(
-                grievance_id=grievance.id,
-                updated_by=student.id,
-                status=grievance_data["status"],
-                remark="Grievance submitted"
+                "grievance_id": grievance_id,
+                "updated_by": student.id,
+                "status": grievance_data["status"],
+                "remark": "Grievance submitted"
                 if grievance_data["status"] == GrievanceStatus.SUBMITTED
                 else "Under review by authority",
+            }
+            for grievance_id, grievance_data, student in zip(
+                result.scalars(), grievances_data, submitters
             )
-            db.add(update)
-
-            submitter_info = (
-                student.display_name
-                if not grievance_data["is_anonymous"]
-                else "Anonymous"
-            )
-            print(
-                f"  Created grievance: {grievance_data['title'][:50]}... (by {submitter_info})"
-            )
-
-        await db.commit()
-
-
-async def create_sample_opportunities(users):
+        ],
+    )
+
+    for grievance_data, student in zip(grievances_data, submitters):
+        submitter_info = (
+            student.display_name
+            if not grievance_data["is_anonymous"]
+            else "Anonymous"
+        )
+        logger.debug(
+            "  Created grievance: %s... (by %s)",
+            grievance_data["title"][:50],
+            submitter_info,
+        )
+    print(f"  Created {len(grievances_data)} grievances")
+
+
+async def create_sample_opportunities(db, by_role, now):
     """Create sample opportunities from multiple faculty and authority."""
     print("\n--- Creating sample opportunities...")
 
-    async for db in get_db():
-        faculties = [u for u in users if u.role == UserRole.FACULTY]
-        authorities = [u for u in users if u.role == UserRole.AUTHORITY]
-        students = [u for u in users if u.role == UserRole.STUDENT]
-
-        if not faculties or not authorities:
-            print("  Warning: Faculty or Authority users not found, skipping opportunities")
-            return
-
-        opportunities_data = [
-            {
-                "title": "Research Assistant - Machine Learning",
-                "description": "Looking for a motivated student to help with research on neural networks and deep learning applications in computer vision.",
-                "type": OpportunityType.RESEARCH,
-                "skills": ["Python", "Machine Learning", "TensorFlow", "PyTorch"],
-                "duration": "6 months",
-                "stipend": "8000/month",
-                "deadline": datetime.now() + timedelta(days=30),
-                "is_open": True,
-                "creator_idx": 0,  # faculty1
-                "creator_type": "faculty",
-            },
-            {
-                "title": "Summer Internship - Web Development",
-                "description": "Full-stack web development internship. Work on real projects using React, Node.js, and PostgreSQL.",
-                "type": OpportunityType.INTERNSHIP,
-                "skills": ["JavaScript", "React", "Node.js", "PostgreSQL"],
-                "duration": "3 months",
-                "stipend": "15000/month",
-                "deadline": datetime.now() + timedelta(days=45),
-                "is_open": True,
-                "creator_idx": 0,  # faculty1
-                "creator_type": "faculty",
-            },
-            {
-                "title": "Research Project - Data Science",
-                "description": "Authority-sponsored research project on campus data analytics and student performance prediction.",
-                "type": OpportunityType.RESEARCH,
-                "skills": ["Python", "Data Science", "Statistics", "Pandas"],
-                "duration": "1 year",
-                "stipend": "10000/month",
-                "deadline": datetime.now() + timedelta(days=60),
-                "is_open": True,
-                "creator_idx": 0,  # authority1
-                "creator_type": "authority",
-            },
-            {
-                "title": "Research Assistant - IoT Systems",
-                "description": "Work on Internet of Things research projects involving sensors, embedded systems, and data collection.",
-                "type": OpportunityType.RESEARCH,
-                "skills": ["C++", "Arduino", "Raspberry Pi", "Embedded Systems"],
-                "duration": "6 months",
-                "stipend": "9000/month",
-                "deadline": datetime.now() + timedelta(days=35),
-                "is_open": True,
-                "creator_idx": 1,  # faculty2
-                "creator_type": "faculty",
-            },
-            {
-                "title": "Campus Sustainability Project",
-                "description": "Lead research on campus sustainability initiatives and green energy solutions.",
-                "type": OpportunityType.RESEARCH,
-                "skills": ["Research", "Data Analysis", "Sustainability", "Reporting"],
-                "duration": "8 months",
-                "stipend": "7500/month",
-                "deadline": datetime.now() + timedelta(days=50),
-                "is_open": True,
-                "creator_idx": 1,  # authority2
-                "creator_type": "authority",
-            },
-        ]
-
-        for opp_data in opportunities_data:
-            creator_idx = opp_data.pop("creator_idx")
-            creator_type = opp_data.pop("creator_type")
-
-            if creator_type == "faculty":
-                creator = faculties[creator_idx % len(faculties)]
-            else:
-                creator = authorities[creator_idx % len(authorities)]
-
-            opportunity = Opportunity(faculty_id=creator.id, **opp_data)
-            db.add(opportunity)
-            await db.flush()
-            print(
-                f"  Created opportunity: {opp_data['title']} (by {creator.display_name})"
-            )
-
-            # Create sample applications from both students
-            for i, student in enumerate(students):
-                application = Application(
-                    opportunity_id=opportunity.id,
-                    student_id=student.id,
-                    status=ApplicationStatus.SUBMITTED
+    faculties = by_role[UserRole.FACULTY]
+    authorities = by_role[UserRole.AUTHORITY]
+    students = by_role[UserRole.STUDENT]
+
+    if not faculties or not authorities:
+        print("  Warning: Faculty or Authority users not found, skipping opportunities")
+        return
+
+    opportunities_data = []
+    creators = []
+    for template in OPPORTUNITY_TEMPLATES:
+        opp_data = dict(template)
+        creator_idx = opp_data.pop("creator_idx")
+        creator_type = opp_data.pop("creator_type")
+        opp_data["deadline"] = now + timedelta(days=opp_data.pop("deadline_days"))
+        opportunities_data.append(opp_data)
+
+        if creator_type == "faculty":
+            creator = faculties[creator_idx % len(faculties)]
+        else:
+            creator = authorities[creator_idx % len(authorities)]
+        creators.append(creator)
+        opp_data["faculty_id"] = creator.id
+
+    # All opportunities in one batched INSERT ... RETURNING (ids in parameter
+    # order), then every application in a single executemany
+    result = await db.execute(
+        insert(Opportunity).returning(Opportunity.id, sort_by_parameter_order=True),
+        opportunities_data,
+    )
+    opportunity_ids = result.scalars().all()
+
+    applications = []
+    for opportunity_id, opp_data, creator in zip(
+        opportunity_ids, opportunities_data, creators
+    ):
+        logger.debug(
+            "  Created opportunity: %s (by %s)", opp_data["title"], creator.display_name
+        )
+
+        # Same cover letter from every student for this opportunity
+        cover_letter = f"I am very interested in this {opp_data['type'].value.lower()} position. I have relevant experience in {', '.join(opp_data['skills'][:2])} and am eager to contribute."
+
+        # Create sample applications from both students
+        for i, student in enumerate(students):
+            applications.append(
+                {
+                    "opportunity_id": opportunity_id,
+                    "student_id": student.id,
+                    "status": ApplicationStatus.SUBMITTED
                     if i == 0
                     else ApplicationStatus.UNDER_REVIEW,
-                    cover_letter=f"I am very interested in this {opp_data['type'].value.lower()} position. I have relevant experience in {', '.join(opp_data['skills'][:2])} and am eager to contribute.",
-                )
-                db.add(application)
-                print(f"    Created application from {student.display_name}")
+                    "cover_letter": cover_letter,
+                }
+            )
+            logger.debug("    Created application from %s", student.display_name)
 
-        await db.commit()
+    if applications:
+        await db.execute(insert(Application), applications)
+    print(
+        f"  Created {len(opportunities_data)} opportunities"
+        f" and {len(applications)} applications"
+    )
 
 
-async def create_sample_tasks(users):
+async def create_sample_tasks(db, by_role):
     """Create sample tasks for multiple students."""
     print("\n--- Creating sample tasks...")
 
-    async for db in get_db():
-        students = [u for u in users if u.role == UserRole.STUDENT]
-        if not students:
-            print("  Warning: No student users found, skipping tasks")
-            return
-
-        # Tasks for student1 (Rahul)
-        tasks_student1 = [
-            {
-                "title": "Complete ML Assignment",
-                "description": "Finish the neural network assignment for CS301",
-                "category": "Academic",
-                "status": TaskStatus.IN_PROGRESS,
-                "progress": 60,
-            },
-            {
-                "title": "Prepare for Midterm",
-                "description": "Study chapters 1-5 for CS201 midterm exam",
-                "category": "Academic",
-                "status": TaskStatus.PENDING,
-                "progress": 0,
-            },
-            {
-                "title": "Research Paper Reading",
-                "description": "Read and summarize 3 papers on deep learning",
-                "category": "Research",
-                "status": TaskStatus.COMPLETED,
-                "progress": 100,
-            },
-        ]
+    students = by_role[UserRole.STUDENT]
+    if not students:
+        print("  Warning: No student users found, skipping tasks")
+        return
+
+    # Tasks for student1 (Rahul)
+    tasks_student1 = [
+        {
+            "title": "Complete ML Assignment",
+            "description": "Finish the neural network assignment for CS301",
+            "category": "Academic",
+            "status": TaskStatus.IN_PROGRESS,
+            "progress": 60,
+        },
+        {
+            "title": "Prepare for Midterm",
+            "description": "Study chapters 1-5 for CS201 midterm exam",
+            "category": "Academic",
+            "status": TaskStatus.PENDING,
+            "progress": 0,
+        },
+        {
+            "title": "Research Paper Reading",
+            "description": "Read and summarize 3 papers on deep learning",
+            "category": "Research",
+            "status": TaskStatus.COMPLETED,
+            "progress": 100,
+        },
+    ]
+
+    # Tasks for student2 (Neha)
+    tasks_student2 = [
+        {
+            "title": "Complete Circuit Design Lab",
+            "description": "Design and simulate amplifier circuit for EE lab",
+            "category": "Academic",
+            "status": TaskStatus.IN_PROGRESS,
+            "progress": 40,
+        },
+        {
+            "title": "Signal Processing Project",
+            "description": "Implement FFT algorithm for DSP course",
+            "category": "Academic",
+            "status": TaskStatus.PENDING,
+            "progress": 10,
+        },
+        {
+            "title": "Apply for Summer Internship",
+            "description": "Prepare resume and apply to 5 companies",
+            "category": "Career",
+            "status": TaskStatus.IN_PROGRESS,
+            "progress": 75,
+        },
+        {
+            "title": "Gym Workout",
+            "description": "Daily workout routine - cardio and weights",
+            "category": "Personal",
+            "status": TaskStatus.PENDING,
+            "progress": 0,
+        },
+    ]
+
+    all_tasks = [(students[0], tasks_student1), (students[1], tasks_student2)]
+
+    for student, tasks_data in all_tasks:
+        for task_data in tasks_data:
+            task = Task(student_id=student.id, **task_data)
+            db.add(task)
+            logger.debug(
+                "  Created task: %s (for %s)", task_data["title"], student.display_name
+            )
+    print(f"  Created {sum(len(tasks) for _, tasks in all_tasks)} tasks")
 
-        # Tasks for student2 (Neha)
-        tasks_student2 = [
-            {
-                "title": "Complete Circuit Design Lab",
-                "description": "Design and simulate amplifier circuit for EE lab",
-                "category": "Academic",
-                "status": TaskStatus.IN_PROGRESS,
-                "progress": 40,
-            },
-            {
-                "title": "Signal Processing Project",
-                "description": "Implement FFT algorithm for DSP course",
-                "category": "Academic",
-                "status": TaskStatus.PENDING,
-                "progress": 10,
-            },
-            {
-                "title": "Apply for Summer Internship",
-                "description": "Prepare resume and apply to 5 companies",
-                "category": "Career",
-                "status": TaskStatus.IN_PROGRESS,
-                "progress": 75,
-            },
-            {
-                "title": "Gym Workout",
-                "description": "Daily workout routine - cardio and weights",
-                "category": "Personal",
-                "status": TaskStatus.PENDING,
-                "progress": 0,
-            },
-        ]
 
-        all_tasks = [(students[0], tasks_student1), (students[1], tasks_student2)]
+async def create_sample_calendar_events(db, courses, now):
+    """Create sample calendar events for courses."""
+    print("\n--- Creating sample calendar events...")
 
-        for student, tasks_data in all_tasks:
-            for task_data in tasks_data:
-                task = Task(student_id=student.id, **task_data)
-                db.add(task)
-                print(
-                    f"  Created task: {task_data['title']} (for {student.display_name})"
-                )
+    if not courses:
+        print("  Warning: No courses found, skipping calendar events")
+        return
 
-        await db.commit()
+    # Define some common event templates
+    event_types = ["Lecture", "Lab", "Quiz", "Assignment Due", "Exam"]
+    
+    # Same schedule anchor for every course: midnight today, so the event
+    # times are plain offsets from it
+    base_date = datetime.combine(now.date(), time.min)
 
+    # Events for all courses, inserted together after the loop
+    all_events = []
 
-async def create_sample_calendar_events(users):
-    """Create sample calendar events for courses."""
-    print("\n--- Creating sample calendar events...")
+    for course in courses:
+        # Determine days based on course code parity to spread them out
+        days_offset = 0 if len(course.code) % 2 == 0 else 1
+        course_base = base_date + timedelta(days=days_offset)
 
-    async for db in get_db():
-        # Get all courses
-        result = await db.execute(select(Course))
-        courses = result.scalars().all()
-        
-        if not courses:
-            print("  Warning: No courses found, skipping calendar events")
-            return
-
-        # Define some common event templates
-        event_types = ["Lecture", "Lab", "Quiz", "Assignment Due", "Exam"]
-        
-        for course in courses:
-            # Create a regular lecture schedule
-            # Let's say this course has 2 lectures a week for the next 4 weeks
-            base_date = datetime.now()
-            
-            # Determine days based on course code parity to spread them out
-            days_offset = 0 if len(course.code) % 2 == 0 else 1
-            
-            events_data = []
-            
-            # 1. Lectures (Recurring)
-            for week in range(4):
-                # Lecture 1
-                lecture_date = base_date + timedelta(weeks=week, days=days_offset)
-                events_data.append({
-                    "title": f"Lecture: {course.name}",
-                    "description": f"Regular scheduled lecture for {course.code}",
-                    "event_type": "Lecture",
-                    "start_date": lecture_date.replace(hour=10, minute=0, second=0, microsecond=0),
-                    "end_date": lecture_date.replace(hour=11, minute=30, second=0, microsecond=0),
-                    "created_by": "System",
-                })
-                
-                # Lecture 2 (2 days later)
-                lecture_date_2 = base_date + timedelta(weeks=week, days=days_offset + 2)
-                events_data.append({
-                    "title": f"Lecture: {course.name}",
-                    "description": f"Regular scheduled lecture for {course.code}",
-                    "event_type": "Lecture",
-                    "start_date": lecture_date_2.replace(hour=10, minute=0, second=0, microsecond=0),
-                    "end_date": lecture_date_2.replace(hour=11, minute=30, second=0, microsecond=0),
-                    "created_by": "System",
-                })
-
-            # 2. Assignment Due
-            due_date = base_date + timedelta(days=14)
-            events_data.append({
-                "title": f"Assignment 1 Due",
-                "description": f"First assignment submission for {course.code}",
-                "event_type": "Assignment",
-                "start_date": due_date.replace(hour=23, minute=59, second=0, microsecond=0),
-                "end_date": due_date.replace(hour=23, minute=59, second=0, microsecond=0),
-                "created_by": "System",
-            })
-            
-            # 3. Quiz
-            quiz_date = base_date + timedelta(days=21) 
-            events_data.append({
-                "title": f"Quiz 1",
-                "description": f"First quiz covering initial chapters of {course.code}",
-                "event_type": "Exam",
-                "start_date": quiz_date.replace(hour=14, minute=0, second=0, microsecond=0),
-                "end_date": quiz_date.replace(hour=15, minute=0, second=0, microsecond=0),
+        # 1. Lectures (Recurring)
+        events_data = [
+            {
+                "title": f"Lecture: {course.name}",
+                "description": f"Regular scheduled lecture for {course.code}",
+                "event_type": "Lecture",
+                "start_date": course_base + start,
+                "end_date": course_base + end,
                 "created_by": "System",
-            })
-
-            for event_data in events_data:
-                event = CalendarEvent(course_id=course.id, **event_data)
-                db.add(event)
-                # await db.flush()
-            
-            print(f"  Created {len(events_data)} calendar events for {course.code}")
+            }
+            for start, end in LECTURE_OFFSETS
+        ]
 
-        await db.commit()
+        # 2. Assignment Due
+        due_date = base_date + ASSIGNMENT_DUE_OFFSET
+        events_data.append({
+            "title": f"Assignment 1 Due",
+            "description": f"First assignment submission for {course.code}",
+            "event_type": "Assignment",
+            "start_date": due_date,
+            "end_date": due_date,
+            "created_by": "System",
+        })
+
+        # 3. Quiz
+        quiz_start, quiz_end = QUIZ_OFFSETS
+        events_data.append({
+            "title": f"Quiz 1",
+            "description": f"First quiz covering initial chapters of {course.code}",
+            "event_type": "Exam",
+            "start_date": base_date + quiz_start,
+            "end_date": base_date + quiz_end,
+            "created_by": "System",
+        })
+
+        all_events.extend(
+            {**event_data, "course_id": course.id} for event_data in events_data
+        )
+
+        logger.debug(
+            "  Created %d calendar events for %s", len(events_data), course.code
+        )
+
+    # One batched executemany instead of an ORM insert per event
+    await db.execute(insert(CalendarEvent), all_events)
+    print(f"  Created {len(all_events)} calendar events for {len(courses)} courses")
 
 
 async def seed_database():
@@ -613,15 +704,34 @@ async def seed_database():
         # Reset database
         await reset_database()
 
-        # Create test users
-        users = await create_test_users()
+        # Single reference time for every generated date, so one seed run
+        # is internally consistent
+        now = datetime.now().replace(microsecond=0)
+
+        # One session and one transaction for all of the sample data; each
+        # step only flushes, and everything is committed together
+        async with AsyncSessionLocal() as db:
+            # Throwaway data: don't wait for the WAL flush on commit. LOCAL
+            # scopes it to this one seeding transaction.
+            print("\nNote: synchronous_commit is OFF for the seed transaction")
+            await db.execute(text("SET LOCAL synchronous_commit = OFF"))
+
+            # Create test users
+            users = await create_test_users(db)
+
+            # Group users by role once; every step picks its roles from this
+            by_role = defaultdict(list)
+            for user in users:
+                by_role[user.role].append(user)
+
+            # Create sample data
+            courses = await create_sample_courses(db, by_role)
+            await create_sample_grievances(db, by_role)
+            await create_sample_opportunities(db, by_role, now)
+            await create_sample_tasks(db, by_role)
+            await create_sample_calendar_events(db, courses, now)
 
-        # Create sample data
-        await create_sample_courses(users)
-        await create_sample_grievances(users)
-        await create_sample_opportunities(users)
-        await create_sample_tasks(users)
-        await create_sample_calendar_events(users)
+            await db.commit()
 
         print("\n" + "=" * 60)
         print("Seeding completed successfully!")
@@ -650,4 +760,7 @@ async def seed_database():
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
+    if "-v" in sys.argv[1:]:
+        logging.basicConfig(format="%(message)s")
+        logger.setLevel(logging.DEBUG)
+    asyncio.run(seed_database(), loop_factory=uvloop_factory)
@@ -1,31 +1,49 @@
 
 import asyncio
+import sys
 import httpx
 
-async def test_login():
-    url = "http://localhost:8000/api/v1/auth/login"
-    # Credentials from seed.py (assuming password123 as per README)
-    payload = {
-        "email": "student1@students.iitmandi.ac.in",
-        "password": "password123"
-    }
-    
-    print(f"Attempting login to {url} with {payload['email']}...")
-    
+# Same optional uvloop as seed.py
+try:
+    import uvloop
+except ImportError:
+    uvloop_factory = None
+else:
+    uvloop_factory = uvloop.new_event_loop
+
+URL = "http://localhost:8000/api/v1/auth/login"
+# Credentials from seed.py (assuming password123 as per README)
+PAYLOAD = {
+    "email": "student1@students.iitmandi.ac.in",
+    "password": "password123"
+}
+
+
+async def attempt_login(client: httpx.AsyncClient):
+    print(f"Attempting login to {URL} with {PAYLOAD['email']}...")
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload)
-            
+        response = await client.post(URL, json=PAYLOAD)
+
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
-        
+
         if response.status_code == 200:
             print("Login SUCCESS!")
         else:
             print("Login FAILED!")
-            
+
     except Exception as e:
         print(f"Error: {e}")
 
+
+async def main(attempts: int = 1):
+    # One client for every attempt, so repeated logins reuse the pooled
+    # keep-alive connection instead of reconnecting each time
+    async with httpx.AsyncClient() as client:
+        for _ in range(attempts):
+            await attempt_login(client)
+
 if __name__ == "__main__":
-    asyncio.run(test_login())
+    attempts = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    asyncio.run(main(attempts), loop_factory=uvloop_factory)
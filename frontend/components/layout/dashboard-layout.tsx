@@ -41,8 +41,8 @@ export default function DashboardLayout({ children }: { children: ReactNode }) {
   const { user, logout } = useAuthStore();
   const pathname = usePathname();
 
-  const handleLogout = () => {
-    logout();
+  const handleLogout = async () => {
+    await logout();
     window.location.href = "/login";
   };
 
@@ -22,35 +22,54 @@ apiClient.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// Refresh tokens are single-use, so requests that fail with 401 together
+// share one refresh instead of each spending the same token
+let refreshRequest: Promise<string> | null = null;
+
+const refreshAccessToken = async () => {
+  const refreshToken = localStorage.getItem("refresh_token");
+  const response = await axios.post(`${API_URL}/auth/refresh`, {
+    refresh_token: refreshToken,
+  });
+
+  const { access_token, refresh_token } = response.data;
+  localStorage.setItem("access_token", access_token);
+  localStorage.setItem("refresh_token", refresh_token);
+  return access_token as string;
+};
+
 // Handle token refresh
 apiClient.interceptors.response.use(
   (response) => response,
   async (error) => {
     const originalRequest = error.config;
 
-    // Don't retry if the request was for login or refresh
-    const isAuthRequest = originalRequest.url?.includes("/auth/login") || originalRequest.url?.includes("/auth/refresh");
+    // Don't retry if the request was for login, refresh or logout
+    const isAuthRequest = ["/auth/login", "/auth/refresh", "/auth/logout"].some((path) =>
+      originalRequest.url?.includes(path)
+    );
 
     if (error.response?.status === 401 && !originalRequest._retry && !isAuthRequest) {
       originalRequest._retry = true;
 
       try {
-        const refreshToken = localStorage.getItem("refresh_token");
-        const response = await axios.post(`${API_URL}/auth/refresh`, {
-          refresh_token: refreshToken,
+        refreshRequest ??= refreshAccessToken().finally(() => {
+          refreshRequest = null;
         });
+        const accessToken = await refreshRequest;
 
-        const { access_token, refresh_token } = response.data;
-        localStorage.setItem("access_token", access_token);
-        localStorage.setItem("refresh_token", refresh_token);
-
-        originalRequest.headers.Authorization = `Bearer ${access_token}`;
+        originalRequest.headers.Authorization = `Bearer ${accessToken}`;
         return apiClient(originalRequest);
       } catch (refreshError) {
-        // Clear tokens and redirect to login
-        localStorage.removeItem("access_token");
-        localStorage.removeItem("refresh_token");
-        window.location.href = "/login";
+        // Only a rejected refresh token ends the session. A 503 or network
+        // error means the server couldn't check it; keep the tokens so a
+        // later request can retry.
+        const status = axios.isAxiosError(refreshError) ? refreshError.response?.status : undefined;
+        if (status !== undefined && status < 500) {
+          localStorage.removeItem("access_token");
+          localStorage.removeItem("refresh_token");
+          window.location.href = "/login";
+        }
         return Promise.reject(refreshError);
       }
     }
@@ -153,7 +172,7 @@ export const grievancesApi = {
   uploadPhoto: async (id: string, file: File) => {
     const formData = new FormData();
     formData.append("file", file);
-    const response = await apiClient.post(`/grievances/${id}/photos`, formData, {
+    const response = await apiClient.post(`/files/grievances/${id}/photos`, formData, {
       headers: { "Content-Type": "multipart/form-data" },
     });
     return response.data;
@@ -1,5 +1,6 @@
 import { create } from "zustand";
 import { persist } from "zustand/middleware";
+import { authApi } from "@/lib/api";
 
 interface User {
   id: string;
@@ -20,7 +21,7 @@ interface AuthState {
   setAuthenticated: (value: boolean) => void;
   setLoading: (value: boolean) => void;
   login: (user: User, accessToken: string, refreshToken: string) => void;
-  logout: () => void;
+  logout: () => Promise<void>;
 }
 
 export const useAuthStore = create<AuthState>()(
@@ -40,10 +41,17 @@ export const useAuthStore = create<AuthState>()(
         set({ user, isAuthenticated: true, isLoading: false });
       },
       
-      logout: () => {
-        localStorage.removeItem("access_token");
-        localStorage.removeItem("refresh_token");
-        set({ user: null, isAuthenticated: false, isLoading: false });
+      logout: async () => {
+        try {
+          // Revoke the refresh token server-side so it can't be reused
+          await authApi.logout();
+        } catch {
+          // Still sign out locally if the server can't be reached
+        } finally {
+          localStorage.removeItem("access_token");
+          localStorage.removeItem("refresh_token");
+          set({ user: null, isAuthenticated: false, isLoading: false });
+        }
       },
     }),
     {